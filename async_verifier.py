@@ -0,0 +1,192 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+import dns.asyncresolver
+
+from dns_cache import worst_failure
+from dns_store import NOERROR, DomainRecord
+from result import VerificationResult
+from verifier import EmailVerifier, EXISTENCE_MX, EXISTENCE_MX_TARGET
+
+
+class AsyncEmailVerifier(EmailVerifier):
+    """
+    asyncio counterpart of EmailVerifier built on dns.asyncresolver.
+
+    verify() and verify_many() mirror the synchronous API but are coroutines;
+    a semaphore bounds the number of DNS queries in flight.
+    """
+
+    resolver_class = dns.asyncresolver.Resolver
+
+    def __init__(self, *args, max_concurrency: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def verify(self, email: str) -> str:
+        """
+        Validate email using DNS checks (NO SMTP).
+
+        Returns:
+            'VALID', 'INVALID', or 'RISKY'
+        """
+        status, domain = self._check_address(email)
+        if status is not None:
+            return status
+        return await self._check_domain(domain)
+
+    async def verify_result(self, email: str) -> VerificationResult:
+        """
+        Validate email like verify(), keeping the reason and the DNS data.
+
+        Returns:
+            VerificationResult with status, reason, domain, MX hosts and timings
+        """
+        start = time.perf_counter()
+        status, reason, domain = self._classify_address(email)
+        checked = time.perf_counter()
+        if status is not None:
+            return VerificationResult(email, status, reason, domain, check_seconds=checked - start)
+        record = await self._resolve_domain(domain)
+        return VerificationResult.for_domain(email, record, checked - start,
+                                             time.perf_counter() - checked)
+
+    async def verify_many(self, emails: Iterable[str],
+                          ordered: bool = True) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Validate many emails concurrently as asyncio tasks.
+
+        At most max_concurrency emails are in flight at once, so `emails`
+        may be a lazy iterator of any length.
+
+        Yields:
+            (email, status) pairs in input order, or in completion order
+            when ordered is False
+        """
+        window = max(1, self.max_concurrency)
+        if ordered:
+            pending = deque()
+            for email in emails:
+                pending.append((email, asyncio.ensure_future(self.verify(email))))
+                if len(pending) >= window:
+                    email, task = pending.popleft()
+                    yield email, await task
+            while pending:
+                email, task = pending.popleft()
+                yield email, await task
+        else:
+            pending = {}
+            for email in emails:
+                pending[asyncio.ensure_future(self.verify(email))] = email
+                if len(pending) >= window:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield pending.pop(task), task.result()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield pending.pop(task), task.result()
+
+    async def _check_domain(self, domain: str) -> str:
+        """Run the DNS checks for a domain that passed the address checks."""
+        return (await self._resolve_domain(domain)).status
+
+    async def _resolve_domain(self, domain: str) -> DomainRecord:
+        """DNS results for a domain, from the domain store or fresh lookups."""
+        if self.store is not None:
+            record = self._stored(domain)
+            if record is not None:
+                return record
+        return self._record_domain(await self.checks.resolve_async(self, domain))
+
+    async def _existence_rcode(self, domain: str, mx_records: list) -> str:
+        """Apply the existence_check policy once MX records are known (see EmailVerifier)."""
+        if self.existence_check == EXISTENCE_MX:
+            return NOERROR
+        failures = []
+        if self.existence_check == EXISTENCE_MX_TARGET and mx_records[0]:
+            rcode = await self._address_rcode(mx_records[0].lower())
+            if rcode == NOERROR:
+                return NOERROR
+            failures.append(rcode)
+        rcode = await self._address_rcode(domain)
+        if rcode == NOERROR:
+            return NOERROR
+        return worst_failure(failures + [rcode])
+
+    async def _address_rcode(self, domain: str) -> str:
+        """
+        Check if domain has A or AAAA records.
+
+        Both queries run concurrently; the first positive answer wins and
+        the other query is cancelled (and awaited, so no task outlives its
+        event loop).
+
+        Returns:
+            NOERROR if an address record exists, otherwise the failure kind
+            (see worst_failure)
+        """
+        pending = {asyncio.ensure_future(self._lookup(domain, rdtype, self._exists))
+                   for rdtype in ('A', 'AAAA')}
+        failures = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    value = task.result()
+                    if value is True:
+                        return NOERROR
+                    failures.append(value.kind)
+            return worst_failure(failures)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Semaphore bounding queries in flight on the running event loop.
+
+        A semaphore is bound to the loop it is first used on, and
+        verify_batches() runs each call on a new loop, so it is replaced
+        whenever the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _lookup(self, domain: str, rdtype: str, extract):
+        """
+        Resolve a record type through the DNS cache.
+
+        Returns:
+            extract(answer) on success, a NegativeAnswer if the lookup failed
+        """
+        cached, value = self.cache.get(domain, rdtype)
+        if cached:
+            return value
+
+        async with self._get_semaphore():
+            started = self._begin_query()
+            try:
+                records = await self.resolver.resolve(domain, rdtype)
+            except Exception as e:
+                negative = self._cache_failure(domain, rdtype, e)
+                self._end_query(rdtype, negative.kind, started)
+                return negative
+            except BaseException:
+                # Cancelled (the other A/AAAA query won): not counted
+                self._end_query(rdtype, None, started)
+                raise
+            self._end_query(rdtype, NOERROR, started)
+
+        value = extract(records)
+        self.cache.put(domain, rdtype, value, records.rrset.ttl)
+        return value
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark.
+Runs one verification engine over a synthetic corpus against the in-process
+FakeResolver and reports emails/s, p50/p99 DNS query latency per record
+type and peak RSS. Nothing
+touches the network, so results are repeatable run to run.
+
+Examples:
+    python benchmarks/bench.py --rows 10k
+    python benchmarks/bench.py --rows 1m --engine async --latency-ms 20 --nxdomain-rate 0.1
+    python benchmarks/bench.py --rows 10m --engine main --json
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as cli  # noqa: E402
+from async_verifier import AsyncEmailVerifier  # noqa: E402
+from corpus import corpus_path, parse_rows  # noqa: E402
+from fake_dns import AsyncFakeResolver, FakeResolver  # noqa: E402
+from planner import verify_batches  # noqa: E402
+from reader import EmailReader  # noqa: E402
+from timing import StageTimings  # noqa: E402
+from verifier import EmailVerifier  # noqa: E402
+
+ENGINES = ('verify', 'batches', 'async', 'main')
+
+
+def dns_latency(stages: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """
+    DNS query latency per record type from StageTimings.snapshot()-style stages.
+
+    Returns:
+        {rdtype: {'p50_ms', 'p99_ms'}} for the 'dns <rdtype>' stages
+    """
+    return {stage[len('dns '):]: {'p50_ms': s['p50'] * 1000, 'p99_ms': s['p99'] * 1000}
+            for stage, s in stages.items() if stage.startswith('dns ')}
+
+
+def read_stage_quantiles(path: str) -> Dict[str, Dict[str, float]]:
+    """Per-stage p50/p99 (seconds) from a metrics file written by main.py --metrics-file."""
+    prefix = 'email_verifier_stage_seconds{'
+    keys = {'0.5': 'p50', '0.99': 'p99'}
+    stages: Dict[str, Dict[str, float]] = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith(prefix):
+                continue
+            labels, value = line[len(prefix):].rsplit('} ', 1)
+            labels = dict(pair.split('=', 1) for pair in labels.split('",'))
+            stage = labels['stage'].strip('"')
+            key = keys.get(labels.get('quantile', '').strip('"'))
+            if key is not None:
+                stages.setdefault(stage, {})[key] = float(value)
+    return stages
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size in MiB of this process or, with main.py
+    --processes, of its largest worker (None where unsupported).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # bytes on macOS, kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_library(engine: str, path: str, resolver_options: dict, args) -> dict:
+    """
+    Benchmark EmailVerifier / verify_batches directly (no output files).
+
+    Stage timings are recorded, as with main.py --timings, for the DNS
+    query latency.
+    """
+    timings = StageTimings()
+    if engine == 'async':
+        verifier = AsyncEmailVerifier(resolver=AsyncFakeResolver(**resolver_options),
+                                      max_concurrency=args.concurrency, timings=timings)
+    else:
+        verifier = EmailVerifier(resolver=FakeResolver(**resolver_options), timings=timings)
+
+    rows = 0
+    start = time.perf_counter()
+    with EmailReader(path) as reader:
+        if engine == 'verify':
+            results = verifier.verify_many(reader, max_workers=args.workers)
+        else:
+            results = verify_batches(verifier, reader, batch_size=args.batch_size,
+                                     max_workers=args.workers)
+        for _ in results:
+            rows += 1
+    elapsed = time.perf_counter() - start
+    verifier.close()
+
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'dns_latency': dns_latency(timings.snapshot()),
+        'queries': verifier.resolver.queries,
+        'cache_hit_ratio': verifier.cache.hit_ratio,
+    }
+
+
+def run_cli(argv: List[str], settings: Optional[dict] = None,
+            stage_timings: bool = False) -> dict:
+    """
+    Run main.main(argv) in isolation and time it.
+
+    Outputs, the checkpoint, the --incremental result store and --dedup
+    partitions go to a temporary directory and the persistent domain store
+    is disabled, so every run starts cold and the working tree is left
+    untouched. `settings` overrides further main.py configuration
+    values (e.g. {'DNS_TIMEOUT': 0.5}). With `stage_timings`, the run
+    records --timings and its per-stage p50/p99 are read back from
+    --metrics-file, which merges the workers' timings under --processes.
+
+    Returns:
+        dict with the number of rows written and the elapsed seconds, plus
+        'stages' ({stage: {'p50', 'p99'}} in seconds) with stage_timings
+    """
+    with tempfile.TemporaryDirectory(prefix='email-bench-') as tmp:
+        overrides = {
+            'OUTPUT_FILES': {fmt: os.path.join(tmp, os.path.basename(name))
+                             for fmt, name in cli.OUTPUT_FILES.items()},
+            'DNS_STORE_FILE': '',
+            'CHECKPOINT_FILE': os.path.join(tmp, 'checkpoint.json'),
+            'RESULT_STORE_FILE': os.path.join(tmp, 'results.sqlite3'),
+            'DEDUP_TMP_DIR': tmp,
+        }
+        overrides.update(settings or {})
+        saved = {name: getattr(cli, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(cli, name, value)
+        metrics_file = os.path.join(tmp, 'metrics.prom')
+        if stage_timings:
+            argv = argv + ['--timings', '--metrics-file', metrics_file]
+        try:
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                cli.main(argv + ['--formats', 'csv'])
+            elapsed = time.perf_counter() - start
+            with open(cli.OUTPUT_FILES['csv'], 'rb') as f:
+                rows = sum(1 for _ in f) - 1
+        finally:
+            for name, value in saved.items():
+                setattr(cli, name, value)
+        result = {'rows': rows, 'seconds': elapsed}
+        if stage_timings:
+            result['stages'] = read_stage_quantiles(metrics_file)
+    return result
+
+
+def run_main(path: str, resolver_options: dict, args) -> dict:
+    """
+    Benchmark main.main() end to end, with CSV output to a temporary directory.
+
+    The fake resolver is plugged in through the verifiers' resolver_class hook;
+    DNS query latency comes from the run's --timings.
+    """
+    saved = EmailVerifier.resolver_class, AsyncEmailVerifier.resolver_class
+    EmailVerifier.resolver_class = functools.partial(FakeResolver, **resolver_options)
+    AsyncEmailVerifier.resolver_class = functools.partial(AsyncFakeResolver, **resolver_options)
+    try:
+        result = run_cli(['--input', path] + args.main_args.split(), stage_timings=True)
+    finally:
+        EmailVerifier.resolver_class, AsyncEmailVerifier.resolver_class = saved
+    result['dns_latency'] = dns_latency(result.pop('stages'))
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline email verification benchmark.")
+    parser.add_argument('--rows', type=parse_rows, default='10k',
+                        help="corpus size: 10k, 100k, 1m, 10m or a number (default: 10k)")
+    parser.add_argument('--engine', choices=ENGINES, default='batches',
+                        help="verify: verify_many thread pool; batches: group-by-domain plan; "
+                             "async: plan on AsyncEmailVerifier; main: full CLI run "
+                             "(default: %(default)s)")
+    parser.add_argument('--domains', type=int, default=50000,
+                        help="distinct domains in the corpus (default: %(default)s)")
+    parser.add_argument('--skew', type=float, default=1.1,
+                        help="Zipf exponent of the domain distribution (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="added latency per DNS query (default: %(default)s)")
+    parser.add_argument('--jitter-ms', type=float, default=0.0,
+                        help="extra latency of up to this much per query (default: %(default)s)")
+    parser.add_argument('--nxdomain-rate', type=float, default=0.05,
+                        help="fraction of domains that do not exist (default: %(default)s)")
+    parser.add_argument('--timeout-rate', type=float, default=0.0,
+                        help="fraction of domains whose queries time out (default: %(default)s)")
+    parser.add_argument('--timeout-ms', type=float, default=100.0,
+                        help="time a timing-out query takes (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=cli.MAX_WORKERS)
+    parser.add_argument('--batch-size', type=int, default=cli.BATCH_SIZE)
+    parser.add_argument('--concurrency', type=int, default=cli.ASYNC_MAX_CONCURRENCY)
+    parser.add_argument('--main-args', default='',
+                        help="extra main.py options for --engine main; use the = form, "
+                             "e.g. --main-args='--async --dedup'")
+    parser.add_argument('--json', action='store_true', help="print one JSON object")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    path = corpus_path(args.rows, args.domains, args.skew, args.seed)
+    resolver_options = {
+        'latency': args.latency_ms / 1000,
+        'jitter': args.jitter_ms / 1000,
+        'nxdomain_rate': args.nxdomain_rate,
+        'timeout_rate': args.timeout_rate,
+        'timeout_delay': args.timeout_ms / 1000,
+        'seed': args.seed,
+    }
+    if args.engine == 'main':
+        result = run_main(path, resolver_options, args)
+    else:
+        result = run_library(args.engine, path, resolver_options, args)
+    result.update({
+        'engine': args.engine,
+        'emails_per_second': result['rows'] / result['seconds'] if result['seconds'] else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+    })
+
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"engine:       {args.engine}")
+    print(f"rows:         {result['rows']:,} ({args.domains:,} domains, skew {args.skew})")
+    print(f"time:         {result['seconds']:.2f}s")
+    print(f"throughput:   {result['emails_per_second']:,.0f} emails/s")
+    for rdtype, latency in result['dns_latency'].items():
+        print(f"DNS {rdtype + ':':<10}p50 {latency['p50_ms']:.3f} ms, "
+              f"p99 {latency['p99_ms']:.3f} ms")
+    if 'queries' in result:
+        print(f"DNS queries:  {result['queries']:,} (cache hit ratio {result['cache_hit_ratio']:.1%})")
+    if result['peak_rss_mb'] is not None:
+        print(f"peak RSS:     {result['peak_rss_mb']:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Synthetic email corpora for benchmarks.
+Domains are drawn from a Zipf distribution, so a few domains account for most
+addresses (as with real lists) and a long tail appears only once or twice.
+A small share of rows are malformed, role accounts or disposable addresses.
+Corpora are generated deterministically from a seed and cached on disk.
+"""
+
+import bisect
+import gzip
+import os
+import random
+from itertools import accumulate
+from typing import Iterator
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+ROLE_PREFIXES = ('info', 'admin', 'support', 'sales', 'noreply')
+DISPOSABLE_DOMAINS = ('mailinator.com', '10minutemail.com', 'guerrillamail.com')
+
+
+def parse_rows(value: str) -> int:
+    """Row count from a size name ('10k', '1m', ...) or a plain integer."""
+    value = value.strip().lower()
+    if value in SIZES:
+        return SIZES[value]
+    return int(value.replace('_', ''))
+
+
+def generate_emails(rows: int, domains: int = 50000, skew: float = 1.1,
+                    invalid_rate: float = 0.02, role_rate: float = 0.01,
+                    disposable_rate: float = 0.01, seed: int = 0) -> Iterator[str]:
+    """
+    Yield `rows` synthetic email addresses.
+
+    Args:
+        domains: number of distinct domains to draw from
+        skew: Zipf exponent; higher concentrates rows on the top domains
+        invalid_rate: fraction of rows that fail the syntax check
+        role_rate: fraction of rows that are role accounts
+        disposable_rate: fraction of rows on disposable domains
+        seed: random seed; the same arguments always give the same corpus
+    """
+    rng = random.Random(seed)
+    cumulative = list(accumulate(1.0 / (rank ** skew) for rank in range(1, domains + 1)))
+    total = cumulative[-1]
+    for n in range(rows):
+        u = rng.random()
+        if u < invalid_rate:
+            yield f'not-an-email-{n}'
+            continue
+        u -= invalid_rate
+        if u < disposable_rate:
+            yield f'user{n}@{rng.choice(DISPOSABLE_DOMAINS)}'
+            continue
+        rank = bisect.bisect_left(cumulative, rng.random() * total)
+        domain = f'domain{rank}.example.com'
+        if u - disposable_rate < role_rate:
+            yield f'{rng.choice(ROLE_PREFIXES)}@{domain}'
+        else:
+            yield f'user{n}@{domain}'
+
+
+def corpus_path(rows: int, domains: int = 50000, skew: float = 1.1, seed: int = 0,
+                data_dir: str = DATA_DIR) -> str:
+    """
+    Path of a gzip corpus file, generating it on first use.
+
+    Returns:
+        path to a file main.py and EmailReader can read directly
+    """
+    path = os.path.join(data_dir, f'corpus-{rows}-{domains}-{skew}-{seed}.txt.gz')
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=1) as f:
+            for email in generate_emails(rows, domains, skew, seed=seed):
+                f.write(email + '\n')
+        os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Local authoritative DNS server for end-to-end load tests.
+Serves zone files over UDP on localhost using dnspython, with knobs for
+injected latency, packet loss and SERVFAIL answers, so the verifier's real
+sockets, timeouts and retries can be exercised without touching the
+internet. Wildcard records (*.zone) are expanded; names outside every loaded
+zone are REFUSED.
+
+Example:
+    python benchmarks/dns_server.py --port 5353 --latency-ms 5 --loss 0.01
+    python main.py --nameservers 127.0.0.1 --dns-port 5353
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import dns.exception
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.zone
+
+FIXTURE_ZONE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'example.zone')
+
+
+def load_zone(path: str) -> dns.zone.Zone:
+    """Load a zone file; the file must set its own $ORIGIN."""
+    return dns.zone.from_file(path, relativize=False)
+
+
+class _Protocol(asyncio.DatagramProtocol):
+
+    def __init__(self, server: 'StubDNSServer'):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.server._handle(self.transport, data, addr)
+
+
+class StubDNSServer:
+    """
+    UDP DNS server answering from zone files.
+
+    Args:
+        zones: zones to serve (see load_zone)
+        host, port: address to bind; port 0 picks a free port
+        latency: seconds to delay every answer
+        jitter: up to this many extra seconds of delay, random per answer
+        loss_rate: fraction of queries dropped without an answer
+        servfail_rate: fraction of queries answered with SERVFAIL
+        seed: seed for the loss/SERVFAIL/jitter draws
+    """
+
+    def __init__(self, zones: Sequence[dns.zone.Zone], host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, loss_rate: float = 0.0,
+                 servfail_rate: float = 0.0, seed: int = 0):
+        self.zones = list(zones)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.loss_rate = loss_rate
+        self.servfail_rate = servfail_rate
+        self.stats = {'queries': 0, 'answered': 0, 'dropped': 0, 'servfail': 0, 'malformed': 0}
+        self._rng = random.Random(seed)
+        self._wire_cache: Dict[tuple, bytes] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def start(self) -> int:
+        """Serve from a background thread; returns the bound port."""
+        self._thread = threading.Thread(target=self.serve_forever, name='dns-server', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self.port
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until stop() is called."""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._transport, _ = self._loop.run_until_complete(
+                self._loop.create_datagram_endpoint(lambda: _Protocol(self),
+                                                    local_addr=(self.host, self.port)))
+            self.port = self._transport.get_extra_info('sockname')[1]
+            self._ready.set()
+            self._loop.run_forever()
+        finally:
+            self._ready.set()
+            if self._transport is not None:
+                self._transport.close()
+            self._loop.close()
+            self._loop = None
+
+    def _handle(self, transport, data: bytes, addr) -> None:
+        self.stats['queries'] += 1
+        try:
+            query = dns.message.from_wire(data)
+        except dns.exception.DNSException:
+            self.stats['malformed'] += 1
+            return
+
+        u = self._rng.random()
+        if u < self.loss_rate:
+            self.stats['dropped'] += 1
+            return
+        if u < self.loss_rate + self.servfail_rate:
+            self.stats['servfail'] += 1
+            response = dns.message.make_response(query)
+            response.set_rcode(dns.rcode.SERVFAIL)
+            wire = response.to_wire()
+        else:
+            wire = self._answer_wire(query)
+        self.stats['answered'] += 1
+
+        delay = self.latency + (self.jitter * self._rng.random() if self.jitter else 0.0)
+        if delay > 0:
+            self._loop.call_later(delay, transport.sendto, wire, addr)
+        else:
+            transport.sendto(wire, addr)
+
+    def _answer_wire(self, query: dns.message.Message) -> bytes:
+        """Wire-format answer, built once per distinct question and re-stamped with the query ID."""
+        key = tuple((q.name, q.rdtype, q.rdclass) for q in query.question)
+        key += (query.flags & dns.flags.RD, query.edns, query.payload)
+        wire = self._wire_cache.get(key)
+        if wire is None:
+            wire = self.answer(query).to_wire()
+            self._wire_cache[key] = wire
+        return struct.pack('!H', query.id) + wire[2:]
+
+    def answer(self, query: dns.message.Message) -> dns.message.Message:
+        """Authoritative answer to a query from the loaded zones."""
+        response = dns.message.make_response(query)
+        if len(query.question) != 1:
+            response.set_rcode(dns.rcode.FORMERR)
+            return response
+        question = query.question[0]
+        zone = self._find_zone(question.name)
+        if zone is None or question.rdclass != dns.rdataclass.IN:
+            response.set_rcode(dns.rcode.REFUSED)
+            return response
+        response.flags |= dns.flags.AA
+
+        node = zone.get_node(question.name)
+        encloser = question.name
+        while node is None and encloser != zone.origin:
+            # Wildcard at the closest existing ancestor (RFC 4592)
+            encloser = encloser.parent()
+            if zone.get_node(encloser) is not None:
+                node = zone.get_node(dns.name.Name((b'*',) + encloser.labels))
+                break
+        if node is None:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            self._add_soa(response, zone)
+            return response
+
+        rdataset = node.get_rdataset(dns.rdataclass.IN, question.rdtype)
+        if rdataset is None:
+            self._add_soa(response, zone)
+            return response
+        rrset = response.find_rrset(response.answer, question.name, dns.rdataclass.IN,
+                                    question.rdtype, create=True)
+        rrset.update(rdataset)
+        if question.rdtype == dns.rdatatype.MX:
+            for exchange in sorted({rdata.exchange for rdata in rdataset}):
+                self._add_glue(response, exchange)
+        return response
+
+    def _find_zone(self, name: dns.name.Name) -> Optional[dns.zone.Zone]:
+        best = None
+        for zone in self.zones:
+            if name.is_subdomain(zone.origin) and (
+                    best is None or len(zone.origin) > len(best.origin)):
+                best = zone
+        return best
+
+    @staticmethod
+    def _add_soa(response: dns.message.Message, zone: dns.zone.Zone) -> None:
+        soa = zone.get_rdataset(zone.origin, dns.rdatatype.SOA)
+        response.find_rrset(response.authority, zone.origin, dns.rdataclass.IN,
+                            dns.rdatatype.SOA, create=True).update(soa)
+
+    def _add_glue(self, response: dns.message.Message, host: dns.name.Name) -> None:
+        zone = self._find_zone(host)
+        node = zone.get_node(host) if zone is not None else None
+        if node is None:
+            return
+        for rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA):
+            rdataset = node.get_rdataset(dns.rdataclass.IN, rdtype)
+            if rdataset is not None:
+                response.find_rrset(response.additional, host, dns.rdataclass.IN, rdtype,
+                                    create=True).update(rdataset)
+
+
+def server_options(args) -> dict:
+    """StubDNSServer keyword arguments from parsed command-line options."""
+    return {
+        'latency': args.latency_ms / 1000,
+        'jitter': args.jitter_ms / 1000,
+        'loss_rate': args.loss,
+        'servfail_rate': args.servfail,
+        'seed': args.seed,
+    }
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--zone', action='append', metavar='PATH',
+                        help=f"zone file to serve, repeatable (default: {FIXTURE_ZONE})")
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help="delay every answer (default: %(default)s)")
+    parser.add_argument('--jitter-ms', type=float, default=0.0,
+                        help="random extra delay of up to this much (default: %(default)s)")
+    parser.add_argument('--loss', type=float, default=0.0,
+                        help="fraction of queries dropped (default: %(default)s)")
+    parser.add_argument('--servfail', type=float, default=0.0,
+                        help="fraction of queries answered SERVFAIL (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def load_zones(paths: Optional[List[str]]) -> List[dns.zone.Zone]:
+    return [load_zone(path) for path in (paths or [FIXTURE_ZONE])]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local UDP DNS server for load tests.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5353)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = StubDNSServer(load_zones(args.zone), host=args.host, port=args.port,
+                           **server_options(args))
+    print(f"Serving {', '.join(z.origin.to_text() for z in server.zones)} "
+          f"on {args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(', '.join(f"{k} {v}" for k, v in server.stats.items()))
+
+
+if __name__ == '__main__':
+    main()
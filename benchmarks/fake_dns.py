@@ -0,0 +1,174 @@
+"""
+In-process fake DNS backend for benchmarks.
+FakeResolver stands in for dns.resolver.Resolver and answers from a synthetic
+zone: every domain gets MX and A records unless its deterministic "fate"
+makes it NXDOMAIN or time out. Answers are real dnspython Answer objects
+(with MX glue and SOA authority records), so the verifier's own parsing and
+caching paths are exercised exactly as against a real server.
+"""
+
+import asyncio
+import threading
+import time
+import zlib
+from typing import Dict, Tuple
+
+import dns.exception
+import dns.message
+import dns.name
+import dns.rdataclass
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
+
+# Domain fates
+EXISTS = 'exists'
+NXDOMAIN = 'nxdomain'
+TIMEOUT = 'timeout'
+
+TTL = 300
+NEGATIVE_TTL = 900
+
+
+class FakeResolver:
+    """
+    Synthetic dns.resolver.Resolver.
+
+    Args:
+        latency: seconds added to every query
+        jitter: up to this many extra seconds, fixed per (domain, rdtype)
+        nxdomain_rate: fraction of domains that do not exist
+        timeout_rate: fraction of domains whose queries time out
+        timeout_delay: seconds a timing-out query takes before failing
+        aaaa_rate: fraction of existing domains that also have AAAA records
+        seed: changes which domains get which fate
+    """
+
+    def __init__(self, configure: bool = True, latency: float = 0.0, jitter: float = 0.0,
+                 nxdomain_rate: float = 0.0, timeout_rate: float = 0.0,
+                 timeout_delay: float = 0.0, aaaa_rate: float = 0.5, seed: int = 0):
+        # Set by verifier.build_resolver; accepted for compatibility
+        self.nameservers = []
+        self.port = 53
+        self.timeout = 2.0
+        self.lifetime = 5.0
+        self.retry_servfail = False
+        self.cache = None
+
+        self.latency = latency
+        self.jitter = jitter
+        self.nxdomain_rate = nxdomain_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        self.aaaa_rate = aaaa_rate
+        self.seed = seed
+        self.queries = 0
+        self._answers: Dict[Tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, qname, rdtype='A', *args, **kwargs):
+        domain, rdtype = self._normalize(qname, rdtype)
+        delay, fate = self._plan(domain, rdtype)
+        if delay:
+            time.sleep(delay)
+        return self._outcome(domain, rdtype, fate)
+
+    def _normalize(self, qname, rdtype) -> Tuple[str, str]:
+        with self._lock:
+            self.queries += 1
+        if not isinstance(rdtype, str):
+            rdtype = dns.rdatatype.to_text(rdtype)
+        return str(qname).rstrip('.').lower(), rdtype.upper()
+
+    def _fraction(self, *parts: str) -> float:
+        """Deterministic pseudo-random number in [0, 1) for a key."""
+        key = '\0'.join((str(self.seed),) + parts).encode('utf-8')
+        return zlib.crc32(key) / 0x100000000
+
+    def _fate(self, domain: str) -> str:
+        # MX hosts share the fate of the domain they serve
+        if domain.startswith('mx.'):
+            domain = domain[3:]
+        u = self._fraction(domain)
+        if u < self.nxdomain_rate:
+            return NXDOMAIN
+        if u < self.nxdomain_rate + self.timeout_rate:
+            return TIMEOUT
+        return EXISTS
+
+    def _plan(self, domain: str, rdtype: str) -> Tuple[float, str]:
+        fate = self._fate(domain)
+        if fate == TIMEOUT:
+            return self.timeout_delay, fate
+        return self.latency + self.jitter * self._fraction(domain, rdtype), fate
+
+    def _outcome(self, domain: str, rdtype: str, fate: str):
+        """Return the answer for a query, or raise the error a real resolver would."""
+        if fate == TIMEOUT:
+            raise dns.exception.Timeout(timeout=self.timeout_delay)
+        key = (domain, rdtype)
+        answer = self._answers.get(key)
+        if answer is None:
+            answer = self._build(domain, rdtype, fate)
+            self._answers[key] = answer
+        if isinstance(answer, tuple):
+            # A fresh exception per raise, so tracebacks do not pile up on a shared one
+            error, kwargs = answer
+            raise error(**kwargs)
+        return answer
+
+    def _build(self, domain: str, rdtype: str, fate: str):
+        name = dns.name.from_text(domain)
+        query = dns.message.make_query(name, rdtype)
+        response = dns.message.make_response(query)
+        records = self._records(domain, rdtype) if fate == EXISTS else None
+        if not records:
+            zone = self._zone(domain)
+            self._add(response, response.authority, dns.rrset.from_text(
+                zone, NEGATIVE_TTL, 'IN', 'SOA',
+                f'ns.{zone}. hostmaster.{zone}. 1 3600 600 86400 {NEGATIVE_TTL}'))
+            if fate == NXDOMAIN:
+                return dns.resolver.NXDOMAIN, {'qnames': [name], 'responses': {name: response}}
+            return dns.resolver.NoAnswer, {'response': response}
+
+        self._add(response, response.answer,
+                  dns.rrset.from_text_list(name, TTL, 'IN', rdtype, records))
+        if rdtype == 'MX':
+            self._add(response, response.additional, dns.rrset.from_text(
+                f'mx.{domain}.', TTL, 'IN', 'A', self._address(domain)))
+        return dns.resolver.Answer(name, dns.rdatatype.from_text(rdtype), dns.rdataclass.IN,
+                                   response)
+
+    @staticmethod
+    def _add(response, section, rrset) -> None:
+        """Add an rrset through the message index, as a parsed response would have it."""
+        response.find_rrset(section, rrset.name, rrset.rdclass, rrset.rdtype,
+                            create=True).update(rrset)
+
+    def _records(self, domain: str, rdtype: str):
+        if rdtype == 'MX':
+            return [] if domain.startswith('mx.') else [f'10 mx.{domain}.']
+        if rdtype == 'A':
+            return [self._address(domain)]
+        if rdtype == 'AAAA' and self._fraction(domain, 'AAAA') < self.aaaa_rate:
+            return ['2001:db8::1']
+        return []
+
+    def _address(self, domain: str) -> str:
+        n = zlib.crc32(domain.encode('utf-8'))
+        return f'10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}'
+
+    @staticmethod
+    def _zone(domain: str) -> str:
+        return '.'.join(domain.split('.')[-2:])
+
+
+class AsyncFakeResolver(FakeResolver):
+    """FakeResolver for dns.asyncresolver users (AsyncEmailVerifier)."""
+
+    async def resolve(self, qname, rdtype='A', *args, **kwargs):
+        domain, rdtype = self._normalize(qname, rdtype)
+        delay, fate = self._plan(domain, rdtype)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._outcome(domain, rdtype, fate)
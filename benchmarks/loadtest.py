@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test over real UDP sockets.
+Starts the local DNS server (dns_server.py) in a separate process, points
+main.py at it with --nameservers/--dns-port and runs a synthetic corpus
+through the full pipeline, reporting emails/s and the query rate the server
+saw. Latency, packet loss and SERVFAIL can be injected to exercise timeouts
+and retries.
+
+Examples:
+    python benchmarks/loadtest.py --rows 100k
+    python benchmarks/loadtest.py --rows 1m --latency-ms 10 --loss 0.01 --main-args=--async
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import run_cli  # noqa: E402
+from corpus import corpus_path, parse_rows  # noqa: E402
+from dns_server import StubDNSServer, add_server_arguments, load_zones, server_options  # noqa: E402
+
+
+def _serve(zone_paths, options: dict, conn) -> None:
+    """Server process: report the port, serve until told to stop, report stats."""
+    server = StubDNSServer(load_zones(zone_paths), **options)
+    conn.send(server.start())
+    conn.recv()
+    server.stop()
+    conn.send(server.stats)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test main.py against a local DNS server.")
+    parser.add_argument('--rows', type=parse_rows, default='100k',
+                        help="corpus size: 10k, 100k, 1m, 10m or a number (default: 100k)")
+    parser.add_argument('--domains', type=int, default=50000,
+                        help="distinct domains in the corpus (default: %(default)s)")
+    parser.add_argument('--skew', type=float, default=1.1,
+                        help="Zipf exponent of the domain distribution (default: %(default)s)")
+    parser.add_argument('--dns-timeout-ms', type=float, default=500.0,
+                        help="resolver timeout per attempt (default: %(default)s)")
+    parser.add_argument('--dns-lifetime-ms', type=float, default=2000.0,
+                        help="resolver lifetime per query, including retries (default: %(default)s)")
+    parser.add_argument('--main-args', default='',
+                        help="extra main.py options; use the = form, e.g. --main-args=--async "
+                             "or --main-args='--processes 4'")
+    parser.add_argument('--json', action='store_true', help="print one JSON object")
+    add_server_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    path = corpus_path(args.rows, args.domains, args.skew, args.seed)
+
+    conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, name='dns-server', daemon=True,
+                                     args=(args.zone, server_options(args), child_conn))
+    server.start()
+    port = conn.recv()
+    try:
+        result = run_cli(
+            ['--input', path, '--nameservers', '127.0.0.1', '--dns-port', str(port)]
+            + args.main_args.split(),
+            settings={'DNS_TIMEOUT': args.dns_timeout_ms / 1000,
+                      'DNS_LIFETIME': args.dns_lifetime_ms / 1000},
+        )
+    finally:
+        conn.send('stop')
+        stats = conn.recv()
+        server.join()
+
+    seconds = result['seconds']
+    result.update({
+        'emails_per_second': result['rows'] / seconds if seconds else 0.0,
+        'queries_per_second': stats['queries'] / seconds if seconds else 0.0,
+        'server': stats,
+    })
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"rows:         {result['rows']:,} ({args.domains:,} domains, skew {args.skew})")
+    print(f"time:         {seconds:.2f}s")
+    print(f"throughput:   {result['emails_per_second']:,.0f} emails/s")
+    print(f"DNS queries:  {stats['queries']:,} ({result['queries_per_second']:,.0f}/s; "
+          f"dropped {stats['dropped']:,}, SERVFAIL {stats['servfail']:,})")
+
+
+if __name__ == '__main__':
+    main()
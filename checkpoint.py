@@ -0,0 +1,38 @@
+"""
+Checkpoints for long validation runs.
+A checkpoint records how many input rows are finished, the size of every
+output file at that point and a snapshot of the DNS cache, so an
+interrupted run can continue with main.py --resume.
+"""
+
+import json
+import os
+import time
+from typing import Optional
+
+
+class Checkpoint:
+    """JSON checkpoint file, replaced atomically on every save."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[dict]:
+        """Return the saved state, or None if there is no checkpoint."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, state: dict) -> None:
+        state = dict(state, saved_at=time.time())
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
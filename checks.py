@@ -0,0 +1,242 @@
+"""
+Pluggable verification checks.
+Every check declares a cost class (pure CPU, local lookup, network) and a
+scope (per-address or per-domain). CheckPipeline always runs them cheapest
+first, so adding a check can never put a network call ahead of a free one:
+local checks run in cost order until one decides the status, and network
+checks run afterwards, once per unique domain.
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dns_cache import TRANSIENT, NegativeAnswer
+from dns_store import NOERROR, DomainRecord
+from result import Reason
+
+# Cost classes, cheapest first
+CPU = 0        # computation on the address alone
+LOCAL = 1      # lookup in an in-memory table or on-disk file
+NETWORK = 2    # DNS queries
+COSTS = (CPU, LOCAL, NETWORK)
+
+# Scopes
+ADDRESS = 'address'  # depends on the whole address
+DOMAIN = 'domain'    # depends only on the domain, so the outcome is shared per domain
+SCOPES = (ADDRESS, DOMAIN)
+
+Outcome = Tuple[str, Reason]  # (status, reason)
+
+
+class Check:
+    """
+    A check that needs no network access.
+
+    Subclasses set name (also the timings stage), cost and scope, and
+    implement run(). A per-domain check must only look at the domain; its
+    outcome is memoised per domain.
+    """
+
+    name = ''
+    cost = CPU
+    scope = ADDRESS
+
+    def run(self, verifier, email: str, local: str, domain: str) -> Optional[Outcome]:
+        """
+        Check a normalized address (local and domain are its parts).
+
+        Returns:
+            None to go on to the next check, or the (status, reason) that
+            decides the address
+        """
+        raise NotImplementedError
+
+
+class DomainCheck:
+    """
+    A network check, run once per unique domain after the local checks pass.
+
+    run() (run_async() for AsyncEmailVerifier) fills in its part of the
+    domain's DomainRecord and returns False to skip the remaining domain
+    checks. The record's status then decides every address on the domain.
+    """
+
+    name = ''
+    cost = NETWORK
+    scope = DOMAIN
+
+    def run(self, verifier, record: DomainRecord) -> bool:
+        raise NotImplementedError
+
+    async def run_async(self, verifier, record: DomainRecord) -> bool:
+        raise NotImplementedError
+
+
+class SyntaxCheck(Check):
+    """
+    Address matches the verifier's email_regex (user@domain.tld) and its
+    domain is a valid DNS name: no empty labels, labels of at most 63
+    characters, at most 253 characters in all. The resolver would reject
+    such a name without sending a query, so it is a syntax error, not a
+    DNS failure.
+    """
+
+    name = 'syntax'
+    cost = CPU
+    scope = ADDRESS
+
+    def run(self, verifier, email, local, domain):
+        if (verifier.email_regex.match(email) and '@' in email
+                and len(domain) <= 253 and not domain.startswith('.') and '..' not in domain
+                and all(len(label) <= 63 for label in domain.split('.'))):
+            return None
+        return 'INVALID', Reason.SYNTAX
+
+
+class DisposableCheck(Check):
+    """Domain is a known disposable email provider."""
+
+    name = 'disposable'
+    cost = LOCAL
+    scope = DOMAIN
+
+    def run(self, verifier, email, local, domain):
+        if domain in verifier.disposable_domains:
+            return 'RISKY', Reason.DISPOSABLE
+        return None
+
+
+class RoleCheck(Check):
+    """Local part is a role account (admin@, info@, ...), ignoring '.', '-' and '_'."""
+
+    name = 'role'
+    cost = LOCAL
+    scope = ADDRESS
+
+    def run(self, verifier, email, local, domain):
+        if local.replace('.', '').replace('-', '').replace('_', '') in verifier.role_prefixes:
+            return 'RISKY', Reason.ROLE
+        return None
+
+
+class MXCheck(DomainCheck):
+    """Domain has MX records; a failed lookup ends the domain checks."""
+
+    name = 'mx'
+
+    def run(self, verifier, record):
+        return self._apply(record, verifier._lookup(record.domain, 'MX', verifier._mx_hosts))
+
+    async def run_async(self, verifier, record):
+        return self._apply(record, await verifier._lookup(record.domain, 'MX', verifier._mx_hosts))
+
+    @staticmethod
+    def _apply(record: DomainRecord, answer) -> bool:
+        if isinstance(answer, NegativeAnswer):
+            record.rcode = answer.kind
+            record.exists = False
+            return False
+        record.mx_hosts = answer
+        return True
+
+
+class ExistenceCheck(DomainCheck):
+    """
+    Domain exists according to the verifier's existence_check policy (A/AAAA).
+
+    A transient failure (timeout, SERVFAIL) becomes the record's rcode, so the
+    unproven result is not persisted in the domain store.
+    """
+
+    name = 'existence'
+
+    def run(self, verifier, record):
+        return self._apply(record, verifier._existence_rcode(record.domain, record.mx_hosts))
+
+    async def run_async(self, verifier, record):
+        return self._apply(record,
+                           await verifier._existence_rcode(record.domain, record.mx_hosts))
+
+    @staticmethod
+    def _apply(record: DomainRecord, rcode: str) -> bool:
+        record.exists = rcode == NOERROR
+        if rcode in TRANSIENT:
+            record.rcode = rcode
+        return record.exists
+
+
+def default_checks() -> List:
+    """The built-in checks: syntax, disposable, role, MX and domain existence."""
+    return [SyntaxCheck(), DisposableCheck(), RoleCheck(), MXCheck(), ExistenceCheck()]
+
+
+class CheckPipeline:
+    """
+    Runs checks in cost order, stopping at the first that decides an address.
+
+    Checks of equal cost keep the order they were given in. Outcomes of
+    per-domain local checks are memoised, up to `memo_size` domains per
+    check; network checks are left to the verifier's DNS cache and domain
+    store.
+    """
+
+    def __init__(self, checks: Sequence, memo_size: int = 65536):
+        ordered = sorted(checks, key=lambda check: check.cost)
+        for check in ordered:
+            if check.cost not in COSTS or check.scope not in SCOPES:
+                raise ValueError(f"check {check.name!r} has an unknown cost or scope")
+            if check.cost == NETWORK and check.scope != DOMAIN:
+                raise ValueError(f"network check {check.name!r} must be per-domain")
+        self.checks = ordered
+        self.local_checks = [check for check in ordered if check.cost != NETWORK]
+        self.domain_checks = [check for check in ordered if check.cost == NETWORK]
+        self.memo_size = memo_size
+        self._memos: Dict[str, Dict[str, Optional[Outcome]]] = {
+            check.name: {} for check in self.local_checks if check.scope == DOMAIN
+        }
+
+    def classify(self, verifier, email: str) -> Tuple[Optional[str], Optional[Reason], str]:
+        """
+        Run the local checks on a normalized, non-empty address.
+
+        Returns:
+            (status, reason, domain) where status and reason are None if the
+            domain checks are still needed; domain is '' for a syntax failure
+        """
+        local, _, domain = email.rpartition('@')
+        timings = verifier.timings
+        for check in self.local_checks:
+            if timings is not None:
+                started = time.perf_counter()
+            memo = self._memos.get(check.name)
+            if memo is None:
+                outcome = check.run(verifier, email, local, domain)
+            else:
+                outcome = memo.get(domain, memo)
+                if outcome is memo:
+                    outcome = check.run(verifier, email, local, domain)
+                    if len(memo) >= self.memo_size:
+                        memo.clear()
+                    memo[domain] = outcome
+            if timings is not None:
+                timings.record(check.name, time.perf_counter() - started)
+            if outcome is not None:
+                status, reason = outcome
+                return status, reason, '' if reason is Reason.SYNTAX else domain
+        return None, None, domain
+
+    def resolve(self, verifier, domain: str) -> DomainRecord:
+        """Run the domain checks for a domain whose addresses passed the local checks."""
+        record = DomainRecord(domain, [], True, NOERROR)
+        for check in self.domain_checks:
+            if not check.run(verifier, record):
+                break
+        return record
+
+    async def resolve_async(self, verifier, domain: str) -> DomainRecord:
+        """resolve() for AsyncEmailVerifier."""
+        record = DomainRecord(domain, [], True, NOERROR)
+        for check in self.domain_checks:
+            if not await check.run_async(verifier, record):
+                break
+        return record
@@ -5,6 +5,9 @@ INPUT_FILE = 'emails_input.txt'
 OUTPUT_TXT = 'emails_output.txt'
 OUTPUT_CSV = 'emails_output.csv'
 OUTPUT_XLSX = 'emails_output.xlsx'
+OUTPUT_JSONL = 'emails_output.jsonl'
+OUTPUT_PARQUET = 'emails_output.parquet'
+OUTPUT_FORMATS = ['txt', 'csv', 'xlsx']  # any of: txt, csv, xlsx, jsonl, parquet
 
 # Disposable Domain Detection
 DISPOSABLE_DOMAINS_FILE = 'disposable_domains.txt'
@@ -14,4 +17,55 @@ ROLE_ACCOUNTS = {
     'admin', 'administrator', 'webmaster', 'postmaster', 'hostmaster',
     'support', 'help', 'sales', 'info', 'contact', 'billing', 'security',
     'abuse', 'noreply', 'marketing', 'jobs', 'hr', 'no-reply', 'donotreply'
-}
\ No newline at end of file
+}
+
+# DNS Resolver
+DNS_NAMESERVERS = []         # e.g. ['127.0.0.1'] for a local caching resolver; empty = system config
+DNS_PORT = 53
+DNS_TIMEOUT = 2.0            # seconds per nameserver attempt
+DNS_LIFETIME = 5.0           # total seconds per query, including retries
+DNS_RETRY_SERVFAIL = False   # retry nameservers that answer SERVFAIL
+DNS_RESOLVER_CACHE_SIZE = 0  # dnspython's own LRUCache (0 = disabled)
+EXISTENCE_CHECK = 'always'   # 'always': A/AAAA on the domain; 'mx-target': resolving MX host
+                             # (glue or lookup) is enough; 'mx': MX answer alone is enough
+
+# DNS Result Cache
+DNS_CACHE_SIZE = 10000       # max (domain, record type) entries, LRU-evicted
+DNS_CACHE_MAX_TTL = 86400    # upper bound on how long an answer is reused (seconds)
+DNS_NEGATIVE_TTL_MIN = 60    # floor for NXDOMAIN/NoAnswer caching (also used without an SOA)
+DNS_NEGATIVE_TTL_MAX = 3600  # ceiling for the SOA-derived negative TTL
+DNS_FAILURE_TTL = 30         # timeouts and SERVFAIL (NoNameservers) are retried sooner
+
+# Persistent DNS Store (shared across runs)
+DNS_STORE_FILE = 'dns_cache.sqlite3'  # empty string disables the store
+DNS_STORE_TTL = 86400                 # seconds a resolved domain is reused
+DNS_STORE_NEGATIVE_TTL = 21600        # seconds an NXDOMAIN/no-MX domain is reused
+
+# Concurrency
+MAX_WORKERS = 32             # threads used for concurrent DNS lookups
+ASYNC_MAX_CONCURRENCY = 1000 # DNS queries in flight with main.py --async
+BATCH_SIZE = 10000           # emails grouped by domain per execution plan
+PROCESSES = 1                # worker processes sharded by domain (main.py --processes)
+
+# Output Writer
+WRITER_BATCH_SIZE = 1000     # results handed to the writer thread at a time
+WRITER_QUEUE_SIZE = 64       # batches queued before verification waits for the writer
+
+# Progress Reporting
+PROGRESS_UPDATES_PER_SECOND = 1.0  # status line refresh rate (per-address lines with --verbose)
+
+# Incremental Revalidation (main.py --incremental)
+RESULT_STORE_FILE = 'email_results.sqlite3'
+RESULT_MAX_AGE_HOURS = 168.0 # stored results older than this are verified again
+
+# Deduplication (main.py --dedup)
+DEDUP_PARTITIONS = 64        # on-disk hash partitions; more partitions = less memory each
+DEDUP_TMP_DIR = ''           # directory for partition files (empty = system temp dir)
+
+# Checkpoints (resume with main.py --resume)
+CHECKPOINT_FILE = 'emails_checkpoint.json'
+CHECKPOINT_EVERY = 50000     # rows between checkpoints (0 disables checkpointing)
+
+# Metrics (main.py --metrics-port / --metrics-file)
+METRICS_HOST = '127.0.0.1'   # address the /metrics endpoint binds to
+METRICS_FILE_INTERVAL = 15.0 # seconds between --metrics-file rewrites
\ No newline at end of file
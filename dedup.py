@@ -0,0 +1,112 @@
+"""
+Input deduplication.
+Rows are spilled to hash partitions on disk by normalised email, each
+partition's unique addresses are verified once, and the per-row results are
+merged back into the original row order. Memory is bounded by the number of
+unique addresses in one partition, not by the size of the input.
+"""
+
+import heapq
+import os
+import tempfile
+import zlib
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from verifier import normalize_email
+
+
+class DedupStats:
+    """Counts of input rows and of unique addresses actually verified."""
+
+    def __init__(self):
+        self.rows = 0
+        self.unique = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.rows - self.unique
+
+
+def verify_deduplicated(verify: Callable[[List[str]], Iterable[Tuple[str, str]]],
+                        emails: Iterable[str], partitions: int = 64,
+                        tmp_dir: Optional[str] = None,
+                        stats: Optional[DedupStats] = None,
+                        on_partition: Optional[Callable[[int, int], None]] = None
+                        ) -> Iterator[Tuple[str, str]]:
+    """
+    Verify each normalised address once and re-expand to every input row.
+
+    Args:
+        verify: runs the normal verification on a list of emails and returns
+            (email, status) pairs in the same order
+        emails: input emails, in output order
+        partitions: number of on-disk hash partitions
+        tmp_dir: directory for partition files (system default if None)
+        on_partition: called with (partitions verified, partitions) before
+            the first partition and after each one; no rows are yielded
+            until every partition is verified
+
+    Yields:
+        (email, status) pairs for every input row, in input order
+    """
+    with tempfile.TemporaryDirectory(prefix='email-dedup-', dir=tmp_dir) as workdir:
+        row_paths = [os.path.join(workdir, f'rows-{p}.tsv') for p in range(partitions)]
+        files = [open(path, 'w', encoding='utf-8') for path in row_paths]
+        rows = 0
+        try:
+            for email in emails:
+                key = normalize_email(email).encode('utf-8')
+                files[zlib.crc32(key) % partitions].write(f"{rows}\t{email}\n")
+                rows += 1
+        finally:
+            for f in files:
+                f.close()
+        if stats is not None:
+            stats.rows += rows
+
+        result_paths = []
+        for path in row_paths:
+            if on_partition is not None:
+                on_partition(len(result_paths), partitions)
+            result_paths.append(_verify_partition(verify, path, stats))
+        if on_partition is not None:
+            on_partition(partitions, partitions)
+        results = [_read_results(path) for path in result_paths]
+        for _, email, status in heapq.merge(*results):
+            yield email, status
+
+
+def _read_rows(path: str) -> Iterator[Tuple[int, str]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            i, email = line.rstrip('\n').split('\t', 1)
+            yield int(i), email
+
+
+def _verify_partition(verify, path: str, stats: Optional[DedupStats]) -> str:
+    """Verify the unique addresses of one partition and write per-row results."""
+    representatives = {}
+    for _, email in _read_rows(path):
+        representatives.setdefault(normalize_email(email), email)
+
+    statuses = {}
+    if representatives:
+        checked = list(verify(list(representatives.values())))
+        for key, (_, status) in zip(representatives, checked):
+            statuses[key] = status
+    if stats is not None:
+        stats.unique += len(statuses)
+
+    result_path = path + '.results'
+    with open(result_path, 'w', encoding='utf-8') as out:
+        for i, email in _read_rows(path):
+            out.write(f"{i}\t{statuses[normalize_email(email)]}\t{email}\n")
+    os.remove(path)
+    return result_path
+
+
+def _read_results(path: str) -> Iterator[Tuple[int, str, str]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            i, status, email = line.rstrip('\n').split('\t', 2)
+            yield int(i), email, status
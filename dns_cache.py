@@ -0,0 +1,155 @@
+"""
+In-process DNS answer cache.
+Entries are keyed by (domain, rdtype), expire after the TTL of the DNS answer
+and are evicted least-recently-used first once the cache is full.
+Failed lookups are cached too (negative caching), so dead domains are only
+queried once per negative TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import dns.rdatatype
+
+# Negative answer kinds
+NXDOMAIN = 'NXDOMAIN'
+NOANSWER = 'NOANSWER'
+NONAMESERVERS = 'NONAMESERVERS'
+TIMEOUT = 'TIMEOUT'
+ERROR = 'ERROR'              # any other failure; never cached
+TRANSIENT = (NONAMESERVERS, TIMEOUT, ERROR)  # may succeed on retry; never persisted
+
+
+def worst_failure(kinds: List[str]) -> str:
+    """Kind that decides a set of failed lookups: transient failures outrank NXDOMAIN/NOANSWER."""
+    for kind in kinds:
+        if kind in TRANSIENT:
+            return kind
+    return kinds[0] if kinds else NOANSWER
+
+
+class NegativeAnswer:
+    """Cached marker for a lookup that produced no records."""
+
+    __slots__ = ('kind',)
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        return f"NegativeAnswer({self.kind})"
+
+
+def soa_negative_ttl(response) -> Optional[int]:
+    """Negative TTL from the SOA in a response's authority section (RFC 2308)."""
+    if response is None:
+        return None
+    for rrset in response.authority:
+        if rrset.rdtype == dns.rdatatype.SOA:
+            return min(rrset.ttl, rrset[0].minimum)
+    return None
+
+
+class DNSCache:
+    """Thread-safe LRU cache of DNS lookup results with TTL-aware expiry."""
+
+    def __init__(self, max_size: int = 10000, max_ttl: int = 86400,
+                 negative_min_ttl: int = 60, negative_max_ttl: int = 3600,
+                 failure_ttl: int = 30, clock=time.monotonic):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.negative_min_ttl = negative_min_ttl
+        self.negative_max_ttl = negative_max_ttl
+        self.failure_ttl = failure_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, domain: str, rdtype: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Returns:
+            (True, value) on a hit, (False, None) on a miss or expired entry
+        """
+        key = (domain, rdtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, domain: str, rdtype: str, value: Any, ttl: float) -> None:
+        """Store a result for `ttl` seconds (capped at max_ttl)."""
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        key = (domain, rdtype)
+        expires = self._clock() + min(ttl, self.max_ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_negative(self, domain: str, rdtype: str, kind: str,
+                     soa_ttl: Optional[int] = None) -> None:
+        """
+        Cache a failed lookup.
+
+        NXDOMAIN and NOANSWER use the SOA minimum TTL clamped to
+        [negative_min_ttl, negative_max_ttl], or negative_min_ttl without an SOA.
+        Timeouts and server failures are transient and use failure_ttl.
+        """
+        if kind in (NXDOMAIN, NOANSWER):
+            ttl = self.negative_min_ttl if soa_ttl is None else soa_ttl
+            ttl = max(self.negative_min_ttl, min(ttl, self.negative_max_ttl))
+        else:
+            ttl = self.failure_ttl
+        self.put(domain, rdtype, NegativeAnswer(kind), ttl)
+
+    def snapshot(self) -> list:
+        """Unexpired entries as JSON-serialisable [domain, rdtype, remaining_ttl, value] lists."""
+        now = self._clock()
+        with self._lock:
+            items = list(self._entries.items())
+        entries = []
+        for (domain, rdtype), (expires, value) in items:
+            if expires > now:
+                if isinstance(value, NegativeAnswer):
+                    value = {'negative': value.kind}
+                entries.append([domain, rdtype, expires - now, value])
+        return entries
+
+    def restore(self, entries: list, age: float = 0.0) -> None:
+        """Load entries from snapshot(), taken `age` seconds ago."""
+        for domain, rdtype, ttl, value in entries:
+            if isinstance(value, dict):
+                value = NegativeAnswer(value['negative'])
+            self.put(domain, rdtype, value, ttl - age)
+
+    def clear(self) -> None:
+        """Drop all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
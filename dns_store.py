@@ -0,0 +1,150 @@
+"""
+Persistent per-domain DNS results shared across runs.
+Results are kept in a SQLite database (WAL mode) keyed by domain, so repeated
+runs only query domains whose stored entry has expired.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from dns_cache import NXDOMAIN, NOANSWER
+
+NOERROR = 'NOERROR'
+
+# Bumped when the table layout changes; older tables are dropped (the store is a cache)
+SCHEMA_VERSION = 2
+
+
+def domain_status(mx_hosts: List[str], exists: bool) -> str:
+    """Status of every address on a domain, given its DNS results."""
+    if not mx_hosts:
+        return 'INVALID'
+    if not exists:
+        return 'RISKY'
+    return 'VALID'
+
+
+class DomainRecord:
+    """
+    DNS results for one domain (expires is None if not read from the store).
+
+    rcode is NOERROR when every lookup was answered, otherwise the kind of
+    the lookup that failed: the MX lookup, or a transient failure of the
+    existence lookups.
+    """
+
+    __slots__ = ('domain', 'mx_hosts', 'exists', 'rcode', 'expires')
+
+    def __init__(self, domain: str, mx_hosts: List[str], exists: bool, rcode: str,
+                 expires: Optional[float] = None):
+        self.domain = domain
+        self.mx_hosts = mx_hosts
+        self.exists = exists
+        self.rcode = rcode
+        self.expires = expires
+
+    @property
+    def status(self) -> str:
+        return domain_status(self.mx_hosts, self.exists)
+
+
+class DomainStore:
+    """
+    SQLite-backed domain result store.
+
+    The database is opened on first use. Writes are buffered and committed
+    in batches of `batch_size`; call close() (or flush()) to persist the rest.
+    Only definitive answers are stored: NOERROR results for `ttl` seconds,
+    NXDOMAIN/NOANSWER for `negative_ttl` seconds. Timeouts and server
+    failures are never persisted, including an MX answer whose existence
+    lookups failed that way. Results are keyed by domain and existence_check
+    policy, since the policy decides what `exists` means.
+    """
+
+    def __init__(self, path: str, ttl: int = 86400, negative_ttl: int = 21600,
+                 batch_size: int = 500):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.batch_size = batch_size
+        self._conn = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                self._conn.execute('DROP TABLE IF EXISTS domains')
+                self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS domains ('
+                ' domain TEXT NOT NULL,'
+                ' existence_check TEXT NOT NULL,'
+                ' mx TEXT NOT NULL,'
+                ' domain_exists INTEGER NOT NULL,'
+                ' rcode TEXT NOT NULL,'
+                ' expires REAL NOT NULL,'
+                ' PRIMARY KEY (domain, existence_check))'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, domain: str, existence_check: str) -> Optional[DomainRecord]:
+        """Return the stored record for a domain, or None if missing or expired."""
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT mx, domain_exists, rcode, expires FROM domains'
+                ' WHERE domain = ? AND existence_check = ?',
+                (domain, existence_check),
+            ).fetchone()
+        if row is None or row[3] <= time.time():
+            return None
+        return DomainRecord(domain, json.loads(row[0]), bool(row[1]), row[2], row[3])
+
+    def put(self, domain: str, existence_check: str, mx_hosts: List[str], exists: bool,
+            rcode: str) -> None:
+        """Queue a domain result for writing."""
+        if rcode == NOERROR:
+            ttl = self.ttl
+        elif rcode in (NXDOMAIN, NOANSWER):
+            ttl = self.negative_ttl
+        else:
+            return
+        row = (domain, existence_check, json.dumps(mx_hosts), int(exists), rcode,
+               time.time() + ttl)
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write all queued results."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO domains'
+                ' (domain, existence_check, mx, domain_exists, rcode, expires)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                self._pending,
+            )
+        self._pending = []
+
+    def close(self) -> None:
+        """Flush queued results and close the database."""
+        with self._lock:
+            self._flush_locked()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -4,107 +4,412 @@ Email Validation Tool
 This script performs email validation using DNS checks (NO SMTP).
 """
 
-import csv
+import argparse
+import functools
+import itertools
 import os
 import sys
-import openpyxl
-from openpyxl.styles import PatternFill
-from verifier import EmailVerifier
+import time
+from async_verifier import AsyncEmailVerifier
+from checkpoint import Checkpoint
+from dedup import DedupStats, verify_deduplicated
+from config import (
+    DNS_CACHE_SIZE, DNS_CACHE_MAX_TTL, DNS_NEGATIVE_TTL_MIN, DNS_NEGATIVE_TTL_MAX,
+    DNS_FAILURE_TTL, MAX_WORKERS, ASYNC_MAX_CONCURRENCY, BATCH_SIZE,
+    DNS_NAMESERVERS, DNS_PORT, DNS_TIMEOUT, DNS_LIFETIME, DNS_RETRY_SERVFAIL,
+    DNS_RESOLVER_CACHE_SIZE, EXISTENCE_CHECK, DNS_STORE_FILE, DNS_STORE_TTL,
+    DNS_STORE_NEGATIVE_TTL, INPUT_FILE, OUTPUT_TXT, OUTPUT_CSV, OUTPUT_XLSX, OUTPUT_JSONL,
+    OUTPUT_PARQUET, OUTPUT_FORMATS, WRITER_BATCH_SIZE, WRITER_QUEUE_SIZE,
+    PROGRESS_UPDATES_PER_SECOND, CHECKPOINT_FILE, CHECKPOINT_EVERY, RESULT_STORE_FILE,
+    RESULT_MAX_AGE_HOURS, DEDUP_PARTITIONS, DEDUP_TMP_DIR, PROCESSES, METRICS_HOST,
+    METRICS_FILE_INTERVAL,
+)
+from dns_cache import DNSCache
+from dns_store import DomainStore
+from metrics import MetricsRegistry, TextfileWriter, progress_metrics, verifier_metrics
+from planner import PlanStats, verify_batch_results, verify_batches
+from progress import ProgressReporter
+from reader import EmailReader
+from result_store import IncrementalStats, ResultStore, verify_incremental
+from sharding import ShardedVerifier, merge_shards, select_shard, shard_path
+from sinks import SINKS, SinkWriter, SpooledSink
+from timing import StageTimings
+from verifier import EmailVerifier, EXISTENCE_CHECKS, build_resolver
 
 
-INPUT_FILE = 'emails_input.txt'
-OUTPUT_TXT = 'emails_output.txt'
-OUTPUT_CSV = 'emails_output.csv'
-OUTPUT_XLSX = 'emails_output.xlsx'
+OUTPUT_FILES = {
+    'txt': OUTPUT_TXT,
+    'csv': OUTPUT_CSV,
+    'xlsx': OUTPUT_XLSX,
+    'jsonl': OUTPUT_JSONL,
+    'parquet': OUTPUT_PARQUET,
+}
 
 
-def main():
+def output_formats(value):
+    """argparse type for a comma-separated list of output formats."""
+    formats = [f.strip().lower() for f in value.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in SINKS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"invalid format(s) {', '.join(unknown)!r}; choose from {', '.join(SINKS)}")
+    return formats
+
+
+def nameserver_list(value):
+    """argparse type for a comma-separated list of nameserver IPs."""
+    return [ns.strip() for ns in value.split(',') if ns.strip()]
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Validate emails using DNS checks (NO SMTP).")
+    parser.add_argument('--input', default=INPUT_FILE,
+                        help="input file, optionally gzip/bz2/xz compressed (default: %(default)s)")
+    parser.add_argument('--formats', type=output_formats, default=OUTPUT_FORMATS,
+                        help=f"comma-separated output formats: {', '.join(SINKS)} "
+                             f"(default: {','.join(OUTPUT_FORMATS)})")
+    parser.add_argument('--verbose', action='store_true',
+                        help="print every address and its status instead of a progress line")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its last checkpoint")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"reuse results stored in {RESULT_STORE_FILE} and only verify new "
+                             f"or expired addresses")
+    parser.add_argument('--max-age', type=float, default=RESULT_MAX_AGE_HOURS, metavar='HOURS',
+                        help="with --incremental, re-verify stored results older than this "
+                             "(default: %(default)s)")
+    parser.add_argument('--dedup', action='store_true',
+                        help="verify each address once, ignoring case and surrounding "
+                             "whitespace; duplicates are spilled to disk, not held in memory "
+                             "(checkpoints start only after every address is verified)")
+    parser.add_argument('--processes', type=int, default=PROCESSES, metavar='N',
+                        help="verify in N worker processes sharded by domain (default: %(default)s)")
+    parser.add_argument('--shard-index', type=int, default=0, metavar='I',
+                        help="with --shard-count, verify only the rows of shard I (0-based)")
+    parser.add_argument('--shard-count', type=int, default=1, metavar='N',
+                        help="split the input into N shards by domain hash and write "
+                             "per-shard outputs")
+    parser.add_argument('--merge-shards', type=int, metavar='N',
+                        help="combine the CSV/JSONL outputs of N shard runs into the final "
+                             "outputs instead of validating")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="use the asyncio engine instead of the thread pool")
+    parser.add_argument('--timings', action='store_true',
+                        help="record per-stage latency histograms and print them at the end")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help=f"serve Prometheus metrics at http://{METRICS_HOST}:PORT/metrics "
+                             f"while running")
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help=f"write Prometheus metrics to PATH every {METRICS_FILE_INTERVAL:g}s "
+                             f"and at the end (node_exporter textfile format)")
+    parser.add_argument('--nameservers', type=nameserver_list, default=DNS_NAMESERVERS,
+                        metavar='IPS',
+                        help="comma-separated nameserver IPs instead of the system resolver")
+    parser.add_argument('--dns-port', type=int, default=DNS_PORT,
+                        help="nameserver port (default: %(default)s)")
+    parser.add_argument('--existence-check', choices=EXISTENCE_CHECKS, default=EXISTENCE_CHECK,
+                        help="what proves a domain with MX records exists (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be between 0 and --shard-count - 1")
+    if args.merge_shards is not None and args.merge_shards < 1:
+        parser.error("--merge-shards must be at least 1")
+    return args
+
+
+def output_path(args, base_dir, fmt):
+    """Output file for a format, suffixed with the shard when --shard-count is set."""
+    path = os.path.join(base_dir, OUTPUT_FILES[fmt])
+    if args.shard_count > 1:
+        path = shard_path(path, args.shard_index, args.shard_count)
+    return path
+
+
+def build_verifier(args, base_dir):
+    """Create the verifier (and its cache, store and resolver) from config and options."""
+    cache = DNSCache(
+        max_size=DNS_CACHE_SIZE,
+        max_ttl=DNS_CACHE_MAX_TTL,
+        negative_min_ttl=DNS_NEGATIVE_TTL_MIN,
+        negative_max_ttl=DNS_NEGATIVE_TTL_MAX,
+        failure_ttl=DNS_FAILURE_TTL,
+    )
+    store = None
+    if DNS_STORE_FILE:
+        store = DomainStore(
+            os.path.join(base_dir, DNS_STORE_FILE),
+            ttl=DNS_STORE_TTL,
+            negative_ttl=DNS_STORE_NEGATIVE_TTL,
+        )
+    verifier_class = AsyncEmailVerifier if args.use_async else EmailVerifier
+    resolver = build_resolver(
+        nameservers=args.nameservers,
+        port=args.dns_port,
+        timeout=DNS_TIMEOUT,
+        lifetime=DNS_LIFETIME,
+        retry_servfail=DNS_RETRY_SERVFAIL,
+        cache_size=DNS_RESOLVER_CACHE_SIZE,
+        resolver_class=verifier_class.resolver_class,
+    )
+    timings = StageTimings() if args.timings else None
+    if args.use_async:
+        return AsyncEmailVerifier(cache=cache, resolver=resolver,
+                                  existence_check=args.existence_check, store=store,
+                                  timings=timings, max_concurrency=ASYNC_MAX_CONCURRENCY)
+    return EmailVerifier(cache=cache, resolver=resolver,
+                         existence_check=args.existence_check, store=store, timings=timings)
+
+
+def save_checkpoint(checkpoint, args, rows, writer, verifier, counts):
+    """Flush outputs and the domain store, then record where the run stands."""
+    writer.sync()
+    if verifier.store is not None:
+        verifier.store.flush()
+    checkpoint.save({
+        'input': args.input,
+        'formats': args.formats,
+        'rows': rows,
+        'outputs': {fmt: os.path.getsize(sink.output_path)
+                    for fmt, sink in zip(args.formats, writer.sinks)},
+        'counts': counts,
+        'cache': verifier.cache.snapshot(),
+    })
+
+
+def merge_outputs(args, base_dir, input_path):
+    """Write the final outputs from the CSV/JSONL outputs of --merge-shards N shard runs."""
+    paths = []
+    for index in range(args.merge_shards):
+        candidates = [shard_path(os.path.join(base_dir, OUTPUT_FILES[fmt]), index, args.merge_shards)
+                      for fmt in ('csv', 'jsonl')]
+        found = [path for path in candidates if os.path.exists(path)]
+        if not found:
+            print(f"Error: no CSV or JSONL output found for shard {index} "
+                  f"({os.path.basename(candidates[0])}).")
+            sys.exit(1)
+        paths.append(found[0])
+    
+    sinks = []
+    for fmt in args.formats:
+        try:
+            sinks.append(SINKS[fmt](os.path.join(base_dir, OUTPUT_FILES[fmt])).open())
+        except (ImportError, OSError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    writer = SinkWriter(sinks, batch_size=WRITER_BATCH_SIZE, max_batches=WRITER_QUEUE_SIZE).start()
+    
+    print(f"Merging {args.merge_shards} shards of {args.input}...")
+    print("=" * 60)
+    with EmailReader(input_path) as reader:
+        progress = ProgressReporter(lambda: reader.progress,
+                                    max_updates_per_second=PROGRESS_UPDATES_PER_SECOND)
+        try:
+            for email, status in merge_shards(reader, paths):
+                progress.update(status)
+                writer.write(email, status)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            sys.exit(1)
+        progress.finish()
+    writer.close()
+    
+    print("=" * 60)
+    print("Merge complete.")
+    print(f"  VALID:   {progress.counts['VALID']}")
+    print(f"  INVALID: {progress.counts['INVALID']}")
+    print(f"  RISKY:   {progress.counts['RISKY']}")
+    print(f"\nOutputs:")
+    for fmt in args.formats:
+        print(f"  - {OUTPUT_FILES[fmt]}")
+    print("=" * 60)
+
+
+def main(argv=None):
     """Main entry point for email validation."""
+    args = parse_args(argv)
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    input_path = os.path.join(base_dir, INPUT_FILE)
+    input_path = os.path.join(base_dir, args.input)
     
     if not os.path.exists(input_path):
-        print(f"Error: {INPUT_FILE} not found.")
+        print(f"Error: {args.input} not found.")
         sys.exit(1)
     
-    with open(input_path, 'r', encoding='utf-8') as f:
-        emails = [line.strip() for line in f if line.strip()]
+    if args.merge_shards is not None:
+        merge_outputs(args, base_dir, input_path)
+        return
+    
+    checkpoint_path = os.path.join(base_dir, CHECKPOINT_FILE)
+    if args.shard_count > 1:
+        checkpoint_path = shard_path(checkpoint_path, args.shard_index, args.shard_count)
+    checkpoint = Checkpoint(checkpoint_path)
+    state = checkpoint.load() if args.resume else None
+    if args.resume and state is None:
+        print("No checkpoint found; starting from the beginning.")
+    if state is not None and (state['input'] != args.input or state['formats'] != args.formats):
+        print(f"Error: checkpoint was written for --input {state['input']} "
+              f"--formats {','.join(state['formats'])}.")
+        sys.exit(1)
     
-    if not emails:
-        print("No emails to validate.")
-        sys.exit(0)
+    reader = EmailReader(input_path).open()
+    emails = iter(reader)
+    if args.shard_count > 1:
+        emails = select_shard(emails, args.shard_index, args.shard_count)
+    if state is not None:
+        # Skip finished rows without verifying them again
+        for _ in itertools.islice(emails, state['rows']):
+            pass
+    elif args.shard_count == 1:
+        # An empty shard still writes (empty) outputs for --merge-shards
+        first = next(emails, None)
+        if first is None:
+            reader.close()
+            print("No emails to validate.")
+            sys.exit(0)
+        emails = itertools.chain([first], emails)
     
-    verifier = EmailVerifier()
+    verifier = build_verifier(args, base_dir)
+    if state is not None:
+        verifier.cache.restore(state['cache'], age=time.time() - state['saved_at'])
     
-    print(f"Starting validation for {len(emails)} emails...")
+    shard = f" (shard {args.shard_index} of {args.shard_count})" if args.shard_count > 1 else ""
+    if state is not None:
+        print(f"Resuming validation of {args.input}{shard} after row {state['rows']}...")
+    else:
+        print(f"Starting validation of {args.input}{shard} ({reader.size} bytes)...")
     print("=" * 60)
     
-    # Create Excel workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Email Validation"
-    ws.append(['Email', 'Status'])
-    
-    # Define cell styles
-    red_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+    # Open the selected output sinks; on resume, cut them back to the checkpoint
+    sinks = []
+    for fmt in args.formats:
+        sink = SINKS[fmt](output_path(args, base_dir, fmt))
+        if CHECKPOINT_EVERY and not sink.appendable:
+            sink = SpooledSink(sink)
+        try:
+            if state is not None:
+                os.truncate(sink.output_path, state['outputs'][fmt])
+            sinks.append(sink.open(append=state is not None))
+        except (ImportError, OSError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    writer = SinkWriter(sinks, batch_size=WRITER_BATCH_SIZE, max_batches=WRITER_QUEUE_SIZE).start()
     
-    # Output paths
-    csv_path = os.path.join(base_dir, OUTPUT_CSV)
-    txt_path = os.path.join(base_dir, OUTPUT_TXT)
-    xlsx_path = os.path.join(base_dir, OUTPUT_XLSX)
+    # Worker processes, each with its own verifier and DNS cache
+    sharded = None
+    if args.processes > 1:
+        sharded = ShardedVerifier(functools.partial(build_verifier, args, base_dir),
+                                  args.processes, batch_size=BATCH_SIZE, max_workers=MAX_WORKERS,
+                                  shard_count=args.shard_count)
+    cache_hit_ratio = sharded.cache_hit_ratio if sharded else lambda: verifier.cache.hit_ratio
     
     # Process emails and write results
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f_csv, \
-         open(txt_path, 'w', encoding='utf-8') as f_txt:
+    progress = ProgressReporter(
+        lambda: reader.progress,
+        cache_hit_ratio=cache_hit_ratio,
+        max_updates_per_second=0 if args.verbose else PROGRESS_UPDATES_PER_SECOND,
+    )
+    if state is not None:
+        progress.resume(state['counts'])
+    plan_stats = PlanStats()
+    
+    # Prometheus metrics, collected on demand from the counters above
+    registry = MetricsRegistry()
+    registry.register(progress_metrics(progress))
+    registry.register(verifier_metrics(sharded if sharded is not None else verifier))
+    exporters = []
+    if args.metrics_port is not None:
+        try:
+            exporters.append(registry.serve(args.metrics_port, host=METRICS_HOST))
+        except OSError as e:
+            print(f"Error: cannot serve metrics on port {args.metrics_port}: {e}")
+            sys.exit(1)
+    if args.metrics_file:
+        exporters.append(TextfileWriter(registry, args.metrics_file,
+                                        interval=METRICS_FILE_INTERVAL).start())
+    
+    def verify(emails):
+        if sharded is not None:
+            return sharded.verify_many(emails)
+        return verify_batches(verifier, emails, batch_size=BATCH_SIZE,
+                              max_workers=MAX_WORKERS, stats=plan_stats)
+    
+    if args.incremental:
+        result_store = ResultStore(os.path.join(base_dir, RESULT_STORE_FILE),
+                                   existence_check=args.existence_check)
+        incremental_stats = IncrementalStats()
         
-        writer = csv.writer(f_csv)
-        writer.writerow(['Email', 'Status'])
+        def verify_all(emails):
+            # Results carry a reason, so timed-out or failed lookups are not stored
+            if sharded is not None:
+                return sharded.verify_results(emails)
+            return verify_batch_results(verifier, emails, batch_size=BATCH_SIZE,
+                                        max_workers=MAX_WORKERS, stats=plan_stats)
         
-        valid_count = 0
-        invalid_count = 0
-        risky_count = 0
+        def verify_stale(emails):
+            return verify_incremental(verify_all, emails, result_store,
+                                      max_age=args.max_age * 3600, batch_size=BATCH_SIZE,
+                                      stats=incremental_stats)
+    
+    # Stored results stand in for fresh ones with --incremental
+    verify_rows = verify_stale if args.incremental else verify
+    if args.dedup:
+        dedup_stats = DedupStats()
+        results = verify_deduplicated(
+            verify_rows, emails, partitions=DEDUP_PARTITIONS, tmp_dir=DEDUP_TMP_DIR or None,
+            stats=dedup_stats,
+            on_partition=lambda done, total: progress.phase('Dedup partitions', done, total),
+        )
+    else:
+        results = verify_rows(emails)
+    for email, status in results:
+        progress.update(status)
+        writer.write(email, status)
         
-        for i, email in enumerate(emails, 1):
-            print(f"[{i}/{len(emails)}] Validating: {email}")
-            status = verifier.verify(email)
-            
-            # Count statuses
-            if status == 'VALID':
-                valid_count += 1
-            elif status == 'INVALID':
-                invalid_count += 1
-            elif status == 'RISKY':
-                risky_count += 1
-            
-            # Write to CSV
-            writer.writerow([email, status])
-            
-            # Write to TXT
-            f_txt.write(f"{email}: {status}\n")
-            
-            # Write to Excel
-            ws.append([email, status])
-            
-            # Apply red fill for INVALID or RISKY
-            if status in ('INVALID', 'RISKY'):
-                for col in range(1, 3):
-                    cell = ws.cell(row=ws.max_row, column=col)
-                    cell.fill = red_fill
-            
+        if args.verbose:
+            print(f"[{progress.total} | {reader.progress:.0%}] Validating: {email}")
             print(f"    → Status: {status}")
+        
+        if CHECKPOINT_EVERY and progress.total % CHECKPOINT_EVERY == 0:
+            save_checkpoint(checkpoint, args, progress.total, writer, verifier, progress.counts)
     
-    # Save Excel file
-    wb.save(xlsx_path)
+    progress.finish()
+    for exporter in exporters:
+        exporter.close()
+    reader.close()
+    verifier.close()
+    if sharded is not None:
+        sharded.close()
+        plan_stats = sharded.plan_stats
+    writer.close()
+    checkpoint.remove()
+    if args.incremental:
+        result_store.close()
     
     print("=" * 60)
     print("Validation complete.")
-    print(f"  VALID:   {valid_count}")
-    print(f"  INVALID: {invalid_count}")
-    print(f"  RISKY:   {risky_count}")
+    print(f"  VALID:   {progress.counts['VALID']}")
+    print(f"  INVALID: {progress.counts['INVALID']}")
+    print(f"  RISKY:   {progress.counts['RISKY']}")
+    checked = progress.total - progress.resumed
+    print(f"  Time:    {progress.elapsed:.1f}s ({checked / max(progress.elapsed, 1e-9):,.0f} emails/s)")
+    if args.dedup:
+        print(f"  Duplicates skipped: {dedup_stats.duplicates} "
+              f"({dedup_stats.unique} unique of {dedup_stats.rows})")
+    if args.incremental:
+        print(f"  Reused stored results: {incremental_stats.reused} "
+              f"(verified {incremental_stats.verified}, "
+              f"{incremental_stats.transient} not stored after DNS failures)")
+    print(f"  Unique domains: {plan_stats.unique_domains} of {plan_stats.dns_addresses} "
+          f"DNS-checked emails ({plan_stats.unique_domain_ratio:.1%})")
+    print(f"  DNS cache hit ratio: {cache_hit_ratio():.1%}")
+    timings = sharded.timings if sharded is not None else verifier.timings
+    if timings is not None:
+        print("  Stage timings:")
+        for line in timings.summary():
+            print(f"    {line}")
     print(f"\nOutputs:")
-    print(f"  - {OUTPUT_TXT}")
-    print(f"  - {OUTPUT_CSV}")
-    print(f"  - {OUTPUT_XLSX}")
+    for fmt in args.formats:
+        print(f"  - {os.path.basename(output_path(args, base_dir, fmt))}")
     print("=" * 60)
 
 
@@ -0,0 +1,206 @@
+"""
+Prometheus metrics.
+MetricsRegistry renders metrics in the Prometheus text exposition format
+(0.0.4), served over HTTP at /metrics or written to a file for the
+node_exporter textfile collector. Values are gathered at scrape time from the
+counters the verifier, DNS cache, stage timings and progress reporter already
+keep, so exposing metrics adds no work to the verification hot path.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, List
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Metric:
+    """One metric family: name, type, help text and its samples."""
+
+    __slots__ = ('name', 'kind', 'help', 'samples')
+
+    def __init__(self, name: str, kind: str, help: str):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.samples = []
+
+    def add(self, value: float, suffix: str = '', **labels) -> 'Metric':
+        self.samples.append((self.name + suffix, labels, value))
+        return self
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples:
+            if labels:
+                pairs = ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+                name = f"{name}{{{pairs}}}"
+            lines.append(f"{name} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collects metrics from registered callables when rendered.
+
+    A collector is called with no arguments and returns an iterable of
+    Metric objects; collectors run on the scraping thread.
+    """
+
+    def __init__(self):
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str) -> None:
+        """Write the metrics atomically, so a collector never reads a partial file."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> 'MetricsServer':
+        """Serve /metrics from a background thread until the server's close()."""
+        return MetricsServer(self, host, port).start()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self) -> None:
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class MetricsServer:
+    """HTTP server exposing a registry at /metrics."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1', port: int = 9108):
+        self._httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.registry = registry
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='metrics-http',
+                                        daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> 'MetricsServer':
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+
+class TextfileWriter:
+    """Rewrite a metrics textfile every `interval` seconds and once more on close()."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-textfile', daemon=True)
+
+    def start(self) -> 'TextfileWriter':
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.registry.write_textfile(self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.registry.write_textfile(self.path)
+
+
+def verifier_metrics(source) -> Callable[[], List[Metric]]:
+    """
+    Collector for an EmailVerifier, AsyncEmailVerifier or ShardedVerifier:
+    DNS queries by rdtype and rcode, queries in flight, DNS cache counters and,
+    when timings are recorded, per-stage latency summaries.
+    """
+    def collect() -> List[Metric]:
+        queries = Metric('email_verifier_dns_queries_total', 'counter',
+                         'DNS queries sent, by record type and outcome.')
+        for (rdtype, rcode), count in sorted(source.query_counts().items()):
+            queries.add(count, rdtype=rdtype, rcode=rcode)
+        metrics = [queries]
+
+        if source.dns_in_flight is not None:
+            metrics.append(Metric('email_verifier_dns_queries_in_flight', 'gauge',
+                                  'DNS queries currently awaiting an answer.')
+                           .add(source.dns_in_flight))
+
+        cache = source.cache_counts()
+        for key, help in (('hits', 'DNS cache lookups answered from the cache.'),
+                          ('misses', 'DNS cache lookups that needed a query.'),
+                          ('evictions', 'DNS cache entries evicted to make room.')):
+            metrics.append(Metric(f'email_verifier_dns_cache_{key}_total', 'counter', help)
+                           .add(cache[key]))
+        metrics.append(Metric('email_verifier_dns_cache_entries', 'gauge',
+                              'Entries currently in the DNS cache.').add(cache['entries']))
+
+        timings = source.timings
+        if timings is not None:
+            stages = Metric('email_verifier_stage_seconds', 'summary',
+                            'Time spent in each verification stage.')
+            for stage, s in timings.snapshot().items():
+                for quantile, key in (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99')):
+                    stages.add(s[key], stage=stage, quantile=quantile)
+                stages.add(s['total'], '_sum', stage=stage)
+                stages.add(s['count'], '_count', stage=stage)
+            metrics.append(stages)
+        return metrics
+
+    return collect
+
+
+def progress_metrics(progress) -> Callable[[], List[Metric]]:
+    """Collector for a ProgressReporter: results by status and input progress."""
+    def collect() -> List[Metric]:
+        emails = Metric('email_verifier_emails_total', 'counter',
+                        'Email addresses processed, by status.')
+        for status, count in dict(progress.counts).items():
+            emails.add(count, status=status)
+        done = Metric('email_verifier_input_progress_ratio', 'gauge',
+                      'Estimated fraction of the input read.').add(progress.fraction_done())
+        return [emails, done]
+
+    return collect
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
@@ -0,0 +1,157 @@
+"""
+Group-by-domain execution plan.
+Addresses are parsed up front, grouped by domain, and the DNS checks run once
+per unique domain; the domain status is then fanned out to every address.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from async_verifier import AsyncEmailVerifier
+from dns_store import DomainRecord
+from result import Reason, VerificationResult
+
+
+class PlanStats:
+    """Running totals across executed batches."""
+
+    def __init__(self):
+        self.addresses = 0
+        self.dns_addresses = 0
+        self.unique_domains = 0
+
+    def add(self, plan: 'BatchPlan') -> None:
+        self.addresses += len(plan.emails)
+        self.dns_addresses += sum(len(rows) for rows in plan.domains.values())
+        self.unique_domains += len(plan.domains)
+
+    @property
+    def unique_domain_ratio(self) -> float:
+        """Unique domains per address that needed DNS checks (lower is better)."""
+        return self.unique_domains / self.dns_addresses if self.dns_addresses else 0.0
+
+
+class BatchPlan:
+    """Verification plan for one batch of addresses."""
+
+    def __init__(self, verifier, emails: Iterable[str]):
+        self.verifier = verifier
+        self.emails = list(emails)
+        self.statuses: List[Optional[str]] = [None] * len(self.emails)
+        self.domains: Dict[str, List[int]] = {}
+        self.local: Dict[int, Tuple[Reason, str]] = {}  # row -> (reason, domain)
+        for i, email in enumerate(self.emails):
+            status, reason, domain = verifier._classify_address(email)
+            if status is not None:
+                self.statuses[i] = status
+                self.local[i] = (reason, domain)
+            else:
+                self.domains.setdefault(domain, []).append(i)
+
+    def run(self, max_workers: int = 32) -> List[Tuple[str, str]]:
+        """Resolve each domain once on a thread pool and return results in input order."""
+        if self.domains:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                statuses = pool.map(self.verifier._check_domain, self.domains)
+                self._assign(statuses)
+        return list(zip(self.emails, self.statuses))
+
+    async def run_async(self) -> List[Tuple[str, str]]:
+        """Resolve each domain once as asyncio tasks and return results in input order."""
+        statuses = await asyncio.gather(*(self.verifier._check_domain(d) for d in self.domains))
+        self._assign(statuses)
+        return list(zip(self.emails, self.statuses))
+
+    def run_results(self, max_workers: int = 32) -> List[VerificationResult]:
+        """Like run(), but return a VerificationResult per address."""
+        resolved = []
+        if self.domains:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                resolved = list(pool.map(self._timed_resolve, self.domains))
+        return self._results(resolved)
+
+    async def run_results_async(self) -> List[VerificationResult]:
+        """Like run_async(), but return a VerificationResult per address."""
+        resolved = await asyncio.gather(*(self._timed_resolve_async(d) for d in self.domains))
+        return self._results(resolved)
+
+    def _timed_resolve(self, domain: str) -> Tuple[DomainRecord, float]:
+        start = time.perf_counter()
+        record = self.verifier._resolve_domain(domain)
+        return record, time.perf_counter() - start
+
+    async def _timed_resolve_async(self, domain: str) -> Tuple[DomainRecord, float]:
+        start = time.perf_counter()
+        record = await self.verifier._resolve_domain(domain)
+        return record, time.perf_counter() - start
+
+    def _assign(self, statuses: Iterable[str]) -> None:
+        for rows, status in zip(self.domains.values(), statuses):
+            for i in rows:
+                self.statuses[i] = status
+
+    def _results(self, resolved: Iterable[Tuple[DomainRecord, float]]) -> List[VerificationResult]:
+        results: List[Optional[VerificationResult]] = [None] * len(self.emails)
+        for i, (reason, domain) in self.local.items():
+            results[i] = VerificationResult(self.emails[i], self.statuses[i], reason, domain)
+        for rows, (record, seconds) in zip(self.domains.values(), resolved):
+            for i in rows:
+                self.statuses[i] = record.status
+                results[i] = VerificationResult.for_domain(self.emails[i], record,
+                                                           dns_seconds=seconds)
+        return results
+
+
+def verify_batches(verifier, emails: Iterable[str], batch_size: int = 10000,
+                   max_workers: int = 32,
+                   stats: Optional[PlanStats] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Verify emails batch by batch using group-by-domain plans.
+
+    Works with both EmailVerifier (thread pool) and AsyncEmailVerifier.
+
+    Yields:
+        (email, status) pairs in input order
+    """
+    return _execute(verifier, emails, batch_size, max_workers, stats, detailed=False)
+
+
+def verify_batch_results(verifier, emails: Iterable[str], batch_size: int = 10000,
+                         max_workers: int = 32,
+                         stats: Optional[PlanStats] = None) -> Iterator[VerificationResult]:
+    """
+    Like verify_batches(), but yield a VerificationResult per address.
+
+    Every address on a domain shares that domain's DNS data, and dns_seconds
+    is the time spent resolving the domain once for the whole batch.
+
+    Yields:
+        VerificationResult objects in input order
+    """
+    return _execute(verifier, emails, batch_size, max_workers, stats, detailed=True)
+
+
+def _execute(verifier, emails: Iterable[str], batch_size: int, max_workers: int,
+             stats: Optional[PlanStats], detailed: bool) -> Iterator:
+    loop = asyncio.new_event_loop() if isinstance(verifier, AsyncEmailVerifier) else None
+    emails = iter(emails)
+    try:
+        while True:
+            batch = list(islice(emails, batch_size))
+            if not batch:
+                break
+            plan = BatchPlan(verifier, batch)
+            if loop is not None:
+                run = plan.run_results_async() if detailed else plan.run_async()
+                results = loop.run_until_complete(run)
+            else:
+                results = plan.run_results(max_workers) if detailed else plan.run(max_workers)
+            if stats is not None:
+                stats.add(plan)
+            yield from results
+    finally:
+        if loop is not None:
+            loop.close()
@@ -0,0 +1,108 @@
+"""
+Throttled progress reporting.
+Replaces per-email output with a status line refreshed at most a few times
+per second: rate, ETA, status counts and DNS cache hit ratio.
+"""
+
+import sys
+import time
+from typing import Callable, Optional, TextIO
+
+
+class ProgressReporter:
+    """Counts results and periodically prints a one-line summary."""
+
+    def __init__(self, fraction_done: Callable[[], float],
+                 cache_hit_ratio: Optional[Callable[[], float]] = None,
+                 max_updates_per_second: float = 1.0, stream: Optional[TextIO] = None,
+                 clock=time.monotonic):
+        self.fraction_done = fraction_done
+        self.cache_hit_ratio = cache_hit_ratio
+        self.interval = 1.0 / max_updates_per_second if max_updates_per_second > 0 else float('inf')
+        self.stream = stream if stream is not None else sys.stdout
+        self.clock = clock
+        self.counts = {'VALID': 0, 'INVALID': 0, 'RISKY': 0}
+        self.total = 0
+        self.resumed = 0
+        self._start_fraction = 0.0
+        self._started = clock()
+        self._last_update = self._started
+        self._phase_started = self._started
+        self._tty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+
+    def resume(self, counts: dict) -> None:
+        """Continue from the counts of an earlier, interrupted run."""
+        self.counts.update(counts)
+        self.total = self.resumed = sum(counts.values())
+        self._start_fraction = self.fraction_done()
+
+    def update(self, status: str) -> None:
+        """Record one result and refresh the status line if the interval has passed."""
+        self.counts[status] = self.counts.get(status, 0) + 1
+        self.total += 1
+        now = self.clock()
+        if now - self._last_update >= self.interval:
+            self._last_update = now
+            self._render(now)
+
+    def finish(self) -> None:
+        """Print the final status line."""
+        self._render(self.clock())
+        if self._tty:
+            self.stream.write('\n')
+        self.stream.flush()
+
+    def phase(self, label: str, done: int, total: int) -> None:
+        """
+        Report progress through a stage that yields no results yet, such as
+        --dedup verifying its partitions. Call with done=0 when it starts.
+        """
+        now = self.clock()
+        if done == 0:
+            self._phase_started = now
+        elif done < total and now - self._last_update < self.interval:
+            return
+        self._last_update = now
+        elapsed = now - self._phase_started
+        eta = elapsed * (total - done) / done if done else None
+        line = f"{label} {done}/{total} | {done / total:.0%} | ETA {self._format_seconds(eta)}"
+        if self.cache_hit_ratio is not None:
+            line += f" | cache hits {self.cache_hit_ratio():.1%}"
+        self._write(line)
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self._started
+
+    def _render(self, now: float) -> None:
+        elapsed = now - self._started
+        rate = (self.total - self.resumed) / elapsed if elapsed > 0 else 0.0
+        done = self.fraction_done()
+        progressed = done - self._start_fraction
+        eta = elapsed * (1 - done) / progressed if progressed > 0 else None
+        line = (
+            f"{self.total} emails | {done:.0%} | {rate:,.0f}/s | "
+            f"ETA {self._format_seconds(eta)} | "
+            f"VALID {self.counts['VALID']} INVALID {self.counts['INVALID']} "
+            f"RISKY {self.counts['RISKY']}"
+        )
+        if self.cache_hit_ratio is not None:
+            line += f" | cache hits {self.cache_hit_ratio():.1%}"
+        self._write(line)
+
+    def _write(self, line: str) -> None:
+        if self._tty:
+            self.stream.write('\r\x1b[K' + line)
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+    @staticmethod
+    def _format_seconds(seconds: Optional[float]) -> str:
+        if seconds is None:
+            return '--:--'
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{seconds:02d}"
+        return f"{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,74 @@
+"""
+Streaming input reader.
+Emails are read lazily one line at a time, so memory use does not depend on
+the size of the input. gzip, bz2 and xz inputs are decompressed on the fly.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+from typing import Iterator
+
+# Leading bytes of each supported compressed format
+_MAGIC = (
+    (b'\x1f\x8b', lambda f: gzip.GzipFile(fileobj=f)),
+    (b'BZh', bz2.BZ2File),
+    (b'\xfd7zXZ\x00', lzma.LZMAFile),
+)
+
+
+class EmailReader:
+    """Iterate over the non-blank, stripped lines of a (possibly compressed) file."""
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.size = os.path.getsize(path)
+        self._raw = None
+        self._text = None
+
+    def open(self) -> 'EmailReader':
+        self._raw = open(self.path, 'rb')
+        head = self._raw.read(6)
+        self._raw.seek(0)
+        stream = self._raw
+        for magic, opener in _MAGIC:
+            if head.startswith(magic):
+                stream = opener(self._raw)
+                break
+        self._text = io.TextIOWrapper(stream, encoding=self.encoding, errors='replace')
+        return self
+
+    def close(self) -> None:
+        if self._text is not None:
+            self._text.close()
+            self._text = None
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+    def __enter__(self) -> 'EmailReader':
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[str]:
+        if self._text is None:
+            self.open()
+        for line in self._text:
+            line = line.strip()
+            if line:
+                yield line
+
+    @property
+    def progress(self) -> float:
+        """
+        Estimated fraction of the input consumed, from the byte offset in the
+        (compressed) file. Read-ahead buffering makes this an estimate.
+        """
+        if self._raw is None or self._raw.closed or not self.size:
+            return 0.0
+        return min(1.0, self._raw.tell() / self.size)
@@ -0,0 +1,90 @@
+"""
+Structured verification results.
+VerificationResult carries the status together with the reason for it and the
+DNS data it was derived from, so callers do not have to re-run checks to find
+out why an address failed.
+"""
+
+from enum import Enum
+from typing import Sequence
+
+from dns_cache import NXDOMAIN, NOANSWER, TIMEOUT, TRANSIENT
+from dns_store import NOERROR, DomainRecord
+
+
+class Reason(str, Enum):
+    """Why an address got its status."""
+
+    OK = 'ok'                      # VALID: MX records and the domain exists
+    EMPTY = 'empty'                # INVALID: blank input
+    SYNTAX = 'syntax'              # INVALID: not user@domain.tld
+    NO_MX = 'no-mx'                # INVALID: domain has no MX records
+    NXDOMAIN = 'nxdomain'          # INVALID: domain does not exist
+    DNS_TIMEOUT = 'dns-timeout'    # INVALID: MX lookup timed out
+    DNS_ERROR = 'dns-error'        # INVALID: MX lookup failed (SERVFAIL, no nameservers, ...)
+    DISPOSABLE = 'disposable'      # RISKY: disposable email provider
+    ROLE = 'role'                  # RISKY: role account (admin@, info@, ...)
+    NO_ADDRESS = 'no-address'      # RISKY: MX records but existence not proven
+
+
+def domain_reason(record: DomainRecord) -> Reason:
+    """Reason for the status of every address on a domain."""
+    if record.mx_hosts:
+        return Reason.OK if record.exists else Reason.NO_ADDRESS
+    if record.rcode in (NOERROR, NOANSWER):
+        return Reason.NO_MX
+    if record.rcode == NXDOMAIN:
+        return Reason.NXDOMAIN
+    if record.rcode == TIMEOUT:
+        return Reason.DNS_TIMEOUT
+    return Reason.DNS_ERROR
+
+
+class VerificationResult:
+    """
+    Outcome of verifying one address.
+
+    mx_hosts is shared with every other result for the same domain, so a
+    batch of results costs little more than its strings. Timings are in
+    seconds: check_seconds for the local checks, dns_seconds for resolving
+    the domain (0.0 if no DNS checks were needed). transient is True when a
+    DNS lookup timed out or failed, so the status may change on a retry.
+    """
+
+    __slots__ = ('email', 'status', 'reason', 'domain', 'mx_hosts',
+                 'check_seconds', 'dns_seconds', 'transient')
+
+    def __init__(self, email: str, status: str, reason: Reason, domain: str = '',
+                 mx_hosts: Sequence[str] = (), check_seconds: float = 0.0,
+                 dns_seconds: float = 0.0, transient: bool = False):
+        self.email = email
+        self.status = status
+        self.reason = reason
+        self.domain = domain
+        self.mx_hosts = mx_hosts
+        self.check_seconds = check_seconds
+        self.dns_seconds = dns_seconds
+        self.transient = transient
+
+    @classmethod
+    def for_domain(cls, email: str, record: DomainRecord, check_seconds: float = 0.0,
+                   dns_seconds: float = 0.0) -> 'VerificationResult':
+        """Result for an address that passed the local checks, from its domain's DNS results."""
+        return cls(email, record.status, domain_reason(record), record.domain,
+                   record.mx_hosts, check_seconds, dns_seconds, record.rcode in TRANSIENT)
+
+    def as_dict(self) -> dict:
+        return {
+            'email': self.email,
+            'status': self.status,
+            'reason': self.reason.value,
+            'domain': self.domain,
+            'mx_hosts': list(self.mx_hosts),
+            'check_seconds': self.check_seconds,
+            'dns_seconds': self.dns_seconds,
+            'transient': self.transient,
+        }
+
+    def __repr__(self) -> str:
+        return f"VerificationResult({self.email!r}, {self.status!r}, {self.reason.value!r})"
+
@@ -0,0 +1,143 @@
+"""
+Stored verification results for incremental revalidation.
+Results are kept in SQLite keyed by normalised email and existence_check
+policy with the time they were checked, so a run only verifies addresses that
+are new or whose stored result is older than the allowed age.
+"""
+
+import sqlite3
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from result import VerificationResult
+from verifier import EXISTENCE_ALWAYS, normalize_email
+
+# Stay below SQLite's bound-parameter limit on older builds
+_MAX_PARAMS = 900
+
+# Bumped when the table layout changes; older tables are dropped
+SCHEMA_VERSION = 2
+
+
+class ResultStore:
+    """
+    SQLite-backed store of email -> (status, checked_at).
+
+    Results are kept per existence_check policy, since the policy can change
+    an address's status; a store only reads and writes its own policy's rows.
+    """
+
+    def __init__(self, path: str, existence_check: str = EXISTENCE_ALWAYS):
+        self.path = path
+        self.existence_check = existence_check
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                self._conn.execute('DROP TABLE IF EXISTS results')
+                self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                ' email TEXT NOT NULL,'
+                ' existence_check TEXT NOT NULL,'
+                ' status TEXT NOT NULL,'
+                ' checked_at REAL NOT NULL,'
+                ' PRIMARY KEY (email, existence_check))'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_fresh(self, keys: List[str], max_age: float) -> Dict[str, str]:
+        """Statuses for the given normalised emails checked within max_age seconds."""
+        conn = self._connect()
+        oldest = time.time() - max_age
+        fresh = {}
+        keys = iter(set(keys))
+        while True:
+            chunk = list(islice(keys, _MAX_PARAMS))
+            if not chunk:
+                return fresh
+            placeholders = ','.join('?' * len(chunk))
+            fresh.update(conn.execute(
+                f'SELECT email, status FROM results'
+                f' WHERE existence_check = ? AND checked_at >= ? AND email IN ({placeholders})',
+                [self.existence_check, oldest] + chunk,
+            ))
+
+    def put_many(self, rows: Iterable[Tuple[str, str]]) -> None:
+        """Save (normalised email, status) pairs checked now."""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO results (email, existence_check, status, checked_at)'
+                ' VALUES (?, ?, ?, ?)',
+                ((key, self.existence_check, status, now) for key, status in rows),
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class IncrementalStats:
+    """Counts of reused and freshly verified rows."""
+
+    def __init__(self):
+        self.reused = 0
+        self.verified = 0
+        self.transient = 0  # verified but not stored: a DNS lookup timed out or failed
+
+
+def verify_incremental(verify: Callable[[List[str]], Iterable[VerificationResult]],
+                       emails: Iterable[str], store: ResultStore, max_age: float,
+                       batch_size: int = 10000,
+                       stats: Optional[IncrementalStats] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Reuse stored results younger than max_age and verify the rest.
+
+    Results that depend on a timed-out or failed DNS lookup are returned but
+    not stored, so the next run verifies those addresses again.
+
+    Args:
+        verify: runs the normal verification on a list of emails and returns
+            VerificationResult objects in the same order
+        emails: input emails, in output order
+
+    Yields:
+        (email, status) pairs in input order, merged from the store and `verify`
+    """
+    emails = iter(emails)
+    while True:
+        batch = list(islice(emails, batch_size))
+        if not batch:
+            return
+        keys = [normalize_email(email) for email in batch]
+        fresh = store.get_fresh(keys, max_age)
+        stale = [email for email, key in zip(batch, keys) if key not in fresh]
+        checked = iter(verify(stale)) if stale else iter(())
+        results = []
+        new_results = []
+        transient = 0
+        for email, key in zip(batch, keys):
+            status = fresh.get(key)
+            if status is None:
+                result = next(checked)
+                status = result.status
+                if result.transient:
+                    transient += 1
+                else:
+                    new_results.append((key, status))
+            results.append((email, status))
+        store.put_many(new_results)
+        if stats is not None:
+            stats.reused += len(batch) - len(stale)
+            stats.verified += len(stale)
+            stats.transient += transient
+        yield from results
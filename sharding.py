@@ -0,0 +1,282 @@
+"""
+Domain-hash sharding.
+Emails are assigned to shards by a stable hash of their domain, so every
+address of a domain lands on the same shard and that shard's DNS cache stays
+hot. ShardedVerifier runs one verifier per worker process and merges the
+results back into input order; the same hash splits a run across machines
+(main.py --shard-index/--shard-count), whose outputs merge_shards recombines.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import traceback
+import zlib
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from planner import PlanStats, verify_batch_results, verify_batches
+from result import VerificationResult
+from timing import StageTimings, merged
+from verifier import normalize_email
+
+
+def email_domain(email: str) -> str:
+    """Normalised domain of an email ('' if there is no '@')."""
+    email = normalize_email(email)
+    return email.rsplit('@', 1)[1] if '@' in email else ''
+
+
+def shard_of(email: str, shard_count: int) -> int:
+    """Stable shard number (0 .. shard_count-1) for an email, by domain."""
+    return zlib.crc32(email_domain(email).encode('utf-8')) % shard_count
+
+
+def worker_of(email: str, processes: int, shard_count: int = 1) -> int:
+    """
+    Worker process (0 .. processes-1) for an email inside one of `shard_count` shards.
+
+    Uses the hash bits above those shard_of() consumed, so the rows of a
+    shard still spread over every worker when the two counts share a factor.
+    """
+    return zlib.crc32(email_domain(email).encode('utf-8')) // shard_count % processes
+
+
+def shard_path(path: str, index: int, shard_count: int) -> str:
+    """Per-shard variant of an output path, e.g. out.csv -> out.shard-2-of-8.csv."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard-{index}-of-{shard_count}{ext}"
+
+
+def select_shard(emails: Iterable[str], index: int, shard_count: int) -> Iterator[str]:
+    """Yield only the emails owned by shard `index`."""
+    return (email for email in emails if shard_of(email, shard_count) == index)
+
+
+def read_results(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Read (email, status) rows back from a CSV or JSONL output file.
+
+    Yields:
+        (email, status) pairs in file order
+    """
+    if path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                yield row['email'], row['status']
+    else:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            rows = csv.reader(f)
+            next(rows, None)
+            for email, status in rows:
+                yield email, status
+
+
+def merge_shards(emails: Iterable[str], paths: Sequence[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Recombine per-shard outputs into input order.
+
+    Each shard's output lists its rows in input order, so walking the input
+    once and taking the next row from the shard that owns each email restores
+    the original order without sorting or holding results in memory.
+
+    Args:
+        emails: the input all shards were run on
+        paths: CSV or JSONL output of shard 0 .. len(paths)-1
+
+    Yields:
+        (email, status) pairs for every input row, in input order
+    """
+    shard_count = len(paths)
+    shards = [read_results(path) for path in paths]
+    for email in emails:
+        index = shard_of(email, shard_count)
+        row = next(shards[index], None)
+        if row is None or row[0] != email:
+            raise ValueError(f"{paths[index]} does not match the input at {email!r}; "
+                             f"was every shard run to completion on the same input?")
+        yield row
+    for index, rest in enumerate(shards):
+        if next(rest, None) is not None:
+            raise ValueError(f"{paths[index]} has more rows than the input assigns to it")
+
+
+def _worker(index: int, factory: Callable, batch_size: int, max_workers: int,
+            tasks, results) -> None:
+    """Verify chunks from `tasks` with a private verifier until told to stop."""
+    verifier = None
+    stats = PlanStats()
+    try:
+        verifier = factory()
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, rows, emails, detailed = task
+            if detailed:
+                values = list(verify_batch_results(
+                    verifier, emails, batch_size=batch_size, max_workers=max_workers, stats=stats))
+            else:
+                values = [status for _, status in verify_batches(
+                    verifier, emails, batch_size=batch_size, max_workers=max_workers, stats=stats)]
+            report = {
+                'cache': verifier.cache_counts(),
+                'queries': verifier.query_counts(),
+                'plan': (stats.addresses, stats.dns_addresses, stats.unique_domains),
+                'timings': verifier.timings,
+            }
+            results.put((index, seq, rows, values, report))
+    except BaseException:
+        results.put((index, None, None, traceback.format_exc(), None))
+    finally:
+        if verifier is not None:
+            verifier.close()
+
+
+class ShardedVerifier:
+    """
+    Verify emails across worker processes sharded by domain hash.
+
+    `factory` builds a verifier inside each worker and must be picklable
+    (e.g. a module-level function or functools.partial of one). Pass the
+    run's shard_count when the input is one shard of a --shard-count run.
+    """
+
+    # Workers only report between chunks, so queries in flight are not known
+    dns_in_flight = None
+
+    def __init__(self, factory: Callable, processes: int, batch_size: int = 10000,
+                 max_workers: int = 32, max_chunks_in_flight: int = 2, shard_count: int = 1):
+        self.processes = processes
+        self.shard_count = shard_count
+        self.chunk_size = batch_size * processes
+        self.max_chunks_in_flight = max_chunks_in_flight
+        ctx = multiprocessing.get_context()
+        self._tasks = [ctx.Queue() for _ in range(processes)]
+        self._results = ctx.Queue()
+        self._workers = [
+            ctx.Process(target=_worker, name=f'verifier-{i}', daemon=True,
+                        args=(i, factory, batch_size, max_workers, self._tasks[i], self._results))
+            for i in range(processes)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._seq = 0
+        # Latest report from each worker (cache, query and plan counters)
+        self._reports: List[Optional[dict]] = [None] * processes
+
+    def verify_many(self, emails: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Yields:
+            (email, status) pairs in input order
+        """
+        for chunk, statuses in self._run(emails, detailed=False):
+            yield from zip(chunk, statuses)
+
+    def verify_results(self, emails: Iterable[str]) -> Iterator[VerificationResult]:
+        """
+        Like verify_many(), but yield a VerificationResult per address.
+
+        Yields:
+            VerificationResult objects in input order
+        """
+        for _, results in self._run(emails, detailed=True):
+            yield from results
+
+    def _run(self, emails: Iterable[str], detailed: bool) -> Iterator[Tuple[List[str], list]]:
+        """Yields each input chunk with its statuses (or results), in input order."""
+        emails = iter(emails)
+        pending: Dict[int, list] = {}  # seq -> [emails, values, parts outstanding]
+        order: List[int] = []
+        exhausted = False
+        while True:
+            while not exhausted and len(order) < self.max_chunks_in_flight:
+                chunk = list(islice(emails, self.chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                self._submit(chunk, pending, order, detailed)
+            if not order:
+                return
+
+            index, seq, rows, values, report = self._results.get()
+            if seq is None:
+                raise RuntimeError(f"verifier worker {index} failed:\n{values}")
+            self._reports[index] = report
+            entry = pending.get(seq)
+            if entry is None:
+                continue  # left over from an abandoned earlier call
+            for row, value in zip(rows, values):
+                entry[1][row] = value
+            entry[2] -= 1
+
+            while order and pending[order[0]][2] == 0:
+                chunk, chunk_values, _ = pending.pop(order.pop(0))
+                yield chunk, chunk_values
+
+    def _submit(self, chunk: List[str], pending: Dict[int, list], order: List[int],
+                detailed: bool) -> None:
+        seq = self._seq
+        self._seq += 1
+        parts = [([], []) for _ in range(self.processes)]
+        for row, email in enumerate(chunk):
+            rows, shard_emails = parts[worker_of(email, self.processes, self.shard_count)]
+            rows.append(row)
+            shard_emails.append(email)
+        outstanding = 0
+        for queue, (rows, shard_emails) in zip(self._tasks, parts):
+            if rows:
+                queue.put((seq, rows, shard_emails, detailed))
+                outstanding += 1
+        pending[seq] = [chunk, [None] * len(chunk), outstanding]
+        order.append(seq)
+
+    def cache_hit_ratio(self) -> float:
+        """DNS cache hit ratio across all workers (as of their last reply)."""
+        counts = self.cache_counts()
+        total = counts['hits'] + counts['misses']
+        return counts['hits'] / total if total else 0.0
+
+    def cache_counts(self) -> Dict[str, int]:
+        """DNS cache counters summed across workers."""
+        totals = {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0}
+        for report in self._reports:
+            if report is not None:
+                for key, value in report['cache'].items():
+                    totals[key] += value
+        return totals
+
+    def query_counts(self) -> Dict[Tuple[str, str], int]:
+        """DNS queries by (rdtype, rcode) summed across workers."""
+        totals: Dict[Tuple[str, str], int] = {}
+        for report in self._reports:
+            if report is not None:
+                for key, value in report['queries'].items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    @property
+    def plan_stats(self) -> PlanStats:
+        """Group-by-domain statistics summed across workers."""
+        stats = PlanStats()
+        for report in self._reports:
+            if report is not None:
+                addresses, dns_addresses, unique_domains = report['plan']
+                stats.addresses += addresses
+                stats.dns_addresses += dns_addresses
+                stats.unique_domains += unique_domains
+        return stats
+
+    @property
+    def timings(self) -> Optional[StageTimings]:
+        """Stage timings merged across workers (None unless the verifiers record them)."""
+        return merged([report['timings'] for report in self._reports if report is not None])
+
+    def close(self) -> None:
+        """Stop the workers and wait for them to exit."""
+        for queue in self._tasks:
+            queue.put(None)
+        for worker in self._workers:
+            worker.join()
@@ -0,0 +1,309 @@
+"""
+Output sinks.
+Each sink writes validation results in one format; main.py feeds the selected
+sinks from a single result stream, so unused formats cost nothing.
+"""
+
+import csv
+import json
+import os
+import queue
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+
+BUFFER_SIZE = 1 << 20
+
+
+class Sink:
+    """
+    Base class for an output format.
+
+    Appendable sinks can be reopened with open(append=True) to continue a
+    file that was truncated back to a checkpoint; output_path is the file
+    whose size the checkpoint records.
+    """
+
+    appendable = False
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @property
+    def output_path(self) -> str:
+        return self.path
+
+    def open(self, append: bool = False) -> 'Sink':
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        raise NotImplementedError
+
+    def write_many(self, rows: Sequence[Tuple[str, str]]) -> None:
+        for email, status in rows:
+            self.write(email, status)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TxtSink(Sink):
+    """`email: STATUS` lines."""
+
+    appendable = True
+
+    def open(self, append: bool = False) -> 'TxtSink':
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8',
+                          buffering=BUFFER_SIZE)
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        self._file.write(f"{email}: {status}\n")
+
+    def write_many(self, rows: Sequence[Tuple[str, str]]) -> None:
+        self._file.writelines(f"{email}: {status}\n" for email, status in rows)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvSink(Sink):
+    """CSV with an Email,Status header."""
+
+    appendable = True
+
+    def open(self, append: bool = False) -> 'CsvSink':
+        self._file = open(self.path, 'a' if append else 'w', newline='', encoding='utf-8',
+                          buffering=BUFFER_SIZE)
+        self._writer = csv.writer(self._file)
+        if not append:
+            self._writer.writerow(['Email', 'Status'])
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        self._writer.writerow([email, status])
+
+    def write_many(self, rows: Sequence[Tuple[str, str]]) -> None:
+        self._writer.writerows(rows)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class XlsxSink(Sink):
+    """Excel workbook with INVALID/RISKY rows filled red."""
+
+    def open(self, append: bool = False) -> 'XlsxSink':
+        # Write-only: rows are streamed to disk on save
+        self._wb = openpyxl.Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("Email Validation")
+        self._ws.append(['Email', 'Status'])
+
+        red_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+        self._red_email = WriteOnlyCell(self._ws)
+        self._red_email.fill = red_fill
+        self._red_status = WriteOnlyCell(self._ws)
+        self._red_status.fill = red_fill
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        if status in ('INVALID', 'RISKY'):
+            self._red_email.value = email
+            self._red_status.value = status
+            self._ws.append([self._red_email, self._red_status])
+        else:
+            self._ws.append([email, status])
+
+    def close(self) -> None:
+        self._wb.save(self.path)
+
+
+class JsonlSink(Sink):
+    """One JSON object per line."""
+
+    appendable = True
+
+    def open(self, append: bool = False) -> 'JsonlSink':
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8',
+                          buffering=BUFFER_SIZE)
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        self._file.write(json.dumps({'email': email, 'status': status}) + '\n')
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink(Sink):
+    """Parquet file written in row groups (requires pyarrow)."""
+
+    row_group_size = 65536
+
+    def open(self, append: bool = False) -> 'ParquetSink':
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([('email', pyarrow.string()), ('status', pyarrow.string())])
+        self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema)
+        self._emails: List[str] = []
+        self._statuses: List[str] = []
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        self._emails.append(email)
+        self._statuses.append(status)
+        if len(self._emails) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._emails:
+            table = self._pa.table({'email': self._emails, 'status': self._statuses},
+                                   schema=self._schema)
+            self._writer.write_table(table)
+            self._emails, self._statuses = [], []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+class SpooledSink(Sink):
+    """
+    Makes a non-appendable sink (XLSX, Parquet) resumable.
+
+    Rows are spooled to `<path>.partial` as CSV during the run and replayed
+    into the wrapped sink on close; the spool is what checkpoints track.
+    """
+
+    appendable = True
+
+    def __init__(self, sink: Sink):
+        super().__init__(sink.path)
+        self.sink = sink
+        self._spool = CsvSink(sink.path + '.partial')
+
+    @property
+    def output_path(self) -> str:
+        return self._spool.path
+
+    def open(self, append: bool = False) -> 'SpooledSink':
+        self._spool.open(append)
+        self.sink.open()
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        self._spool.write(email, status)
+
+    def write_many(self, rows: Sequence[Tuple[str, str]]) -> None:
+        self._spool.write_many(rows)
+
+    def flush(self) -> None:
+        self._spool.flush()
+
+    def close(self) -> None:
+        self._spool.close()
+        with open(self._spool.path, newline='', encoding='utf-8') as f:
+            rows = csv.reader(f)
+            next(rows, None)
+            for email, status in rows:
+                self.sink.write(email, status)
+        self.sink.close()
+        os.remove(self._spool.path)
+
+
+class SinkWriter:
+    """
+    Feed sinks from a dedicated writer thread.
+
+    Results are grouped into batches of `batch_size` and handed over through a
+    queue bounded at `max_batches`, so verification never waits on disk or
+    terminal I/O unless the writer falls that far behind.
+    """
+
+    _STOP = None
+
+    def __init__(self, sinks: Sequence[Sink], batch_size: int = 1000, max_batches: int = 64):
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_batches)
+        self._batch = []
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name='sink-writer', daemon=True)
+
+    def start(self) -> 'SinkWriter':
+        self._thread.start()
+        return self
+
+    def write(self, email: str, status: str) -> None:
+        self._batch.append((email, status))
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the current batch to the writer thread."""
+        if self._error is not None:
+            raise self._error
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def sync(self) -> None:
+        """Block until every result written so far is flushed to the sink files."""
+        self.flush()
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        """Write everything still queued, stop the thread and close the sinks."""
+        self.flush()
+        self._queue.put(self._STOP)
+        self._thread.join()
+        for sink in self.sinks:
+            sink.close()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is self._STOP:
+                    return
+                if self._error is None:
+                    for sink in self.sinks:
+                        sink.write_many(batch)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+
+SINKS: Dict[str, Type[Sink]] = {
+    'txt': TxtSink,
+    'csv': CsvSink,
+    'xlsx': XlsxSink,
+    'jsonl': JsonlSink,
+    'parquet': ParquetSink,
+}
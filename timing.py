@@ -0,0 +1,165 @@
+"""
+Per-stage timing instrumentation.
+StageTimings records how long each verification stage (syntax, disposable and
+role checks, domain store, each DNS record type) takes into HDR-style
+log-linear histograms: constant memory, about 3% relative precision, and
+cheap enough to record on every call. Instrumentation is off unless a
+StageTimings is passed to the verifier.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+# Values below 2 ** (SUB_BUCKET_BITS + 1) ns get their own bucket; above that
+# every power of two is split into 2 ** SUB_BUCKET_BITS buckets.
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = _SUB_BUCKETS << 1
+
+
+def _bucket(value: int) -> int:
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_bounds(index: int):
+    """(lowest, highest) nanosecond value that falls in a bucket."""
+    if index < _LINEAR_LIMIT:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    low = (index - (shift << SUB_BUCKET_BITS)) << shift
+    return low, low + (1 << shift) - 1
+
+
+class Histogram:
+    """Log-linear latency histogram over nanosecond values."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self._counts: Dict[int, int] = {}
+
+    def record(self, seconds: float) -> None:
+        value = int(seconds * 1e9) if seconds > 0 else 0
+        index = _bucket(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram') -> None:
+        for index, n in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """Value in seconds at or below which `percent` of recordings fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                low, high = _bucket_bounds(index)
+                return min((low + high) / 2, self.max) / 1e9
+        return self.max / 1e9
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1e9 if self.count else 0.0
+
+
+class StageTimings:
+    """
+    Latency histograms keyed by stage name.
+
+    Thread-safe; picklable, so worker processes can send theirs back to be
+    merged. Stages appear in the order they were first recorded.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.record(seconds)
+
+    def merge(self, other: 'StageTimings') -> None:
+        with self._lock:
+            for stage, histogram in other.stages.items():
+                self.stages.setdefault(stage, Histogram()).merge(histogram)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            {stage: {'count', 'total', 'mean', 'p50', 'p90', 'p99', 'max'}},
+            durations in seconds
+        """
+        with self._lock:
+            return {
+                stage: {
+                    'count': h.count,
+                    'total': h.total / 1e9,
+                    'mean': h.mean,
+                    'p50': h.percentile(50),
+                    'p90': h.percentile(90),
+                    'p99': h.percentile(99),
+                    'max': h.max / 1e9,
+                }
+                for stage, h in self.stages.items()
+            }
+
+    def summary(self) -> List[str]:
+        """Table of per-stage counts and latencies, one line per stage."""
+        lines = [f"{'stage':<11}{'count':>11}{'total':>10}{'mean':>10}"
+                 f"{'p50':>10}{'p99':>10}{'max':>10}"]
+        for stage, s in self.snapshot().items():
+            lines.append(
+                f"{stage:<11}{s['count']:>11,}{format_duration(s['total']):>10}"
+                f"{format_duration(s['mean']):>10}{format_duration(s['p50']):>10}"
+                f"{format_duration(s['p99']):>10}{format_duration(s['max']):>10}"
+            )
+        return lines
+
+    def __getstate__(self):
+        with self._lock:
+            return {'stages': self.stages}
+
+    def __setstate__(self, state):
+        self.stages = state['stages']
+        self._lock = threading.Lock()
+
+
+def merged(timings: List[Optional[StageTimings]]) -> Optional[StageTimings]:
+    """Combine several StageTimings (None entries are skipped); None if all are None."""
+    result = None
+    for t in timings:
+        if t is not None:
+            if result is None:
+                result = StageTimings()
+            result.merge(t)
+    return result
+
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}µs"
@@ -1,13 +1,76 @@
 import re
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import dns.exception
+import dns.rdatatype
 import dns.resolver
-from typing import Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Set
+from checks import CheckPipeline, default_checks
+from dns_cache import (
+    DNSCache, NegativeAnswer, NXDOMAIN, NOANSWER, NONAMESERVERS, TIMEOUT, ERROR,
+    soa_negative_ttl, worst_failure,
+)
+from dns_store import NOERROR, DomainRecord, DomainStore
+from result import Reason, VerificationResult
+from timing import StageTimings
+
+
+def build_resolver(nameservers: Optional[List[str]] = None, port: int = 53,
+                   timeout: float = 2.0, lifetime: float = 5.0,
+                   retry_servfail: bool = False, cache_size: int = 0,
+                   resolver_class=dns.resolver.Resolver):
+    """
+    Create a configured dnspython resolver.
+    
+    Args:
+        nameservers: nameserver IPs to use instead of the system configuration
+        port: nameserver port
+        timeout: seconds to wait for a single nameserver to answer
+        lifetime: total seconds allowed for a query, including retries
+        retry_servfail: retry a nameserver that answered SERVFAIL
+        cache_size: size of dnspython's own LRUCache (0 disables it)
+        resolver_class: dns.resolver.Resolver or dns.asyncresolver.Resolver
+    """
+    resolver = resolver_class(configure=not nameservers)
+    if nameservers:
+        resolver.nameservers = list(nameservers)
+    resolver.port = port
+    resolver.timeout = timeout
+    resolver.lifetime = lifetime
+    resolver.retry_servfail = retry_servfail
+    if cache_size > 0:
+        resolver.cache = dns.resolver.LRUCache(cache_size)
+    return resolver
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form used for matching addresses (stripped, lowercase)."""
+    return email.strip().lower()
+
+
+# Domain existence policies
+EXISTENCE_ALWAYS = 'always'        # require A/AAAA on the email domain itself
+EXISTENCE_MX_TARGET = 'mx-target'  # a resolving primary MX host (glue or lookup) is enough
+EXISTENCE_MX = 'mx'                # an MX answer alone is enough
+EXISTENCE_CHECKS = (EXISTENCE_ALWAYS, EXISTENCE_MX_TARGET, EXISTENCE_MX)
 
 
 class EmailVerifier:
     """Handles email validation using DNS-based checks (NO SMTP)."""
     
-    def __init__(self, enable_whois=False):
+    resolver_class = dns.resolver.Resolver
+    address_pool_size = 64
+    
+    def __init__(self, enable_whois=False, cache: Optional[DNSCache] = None,
+                 cache_size: int = 10000, cache_max_ttl: int = 86400, resolver=None,
+                 existence_check: str = EXISTENCE_ALWAYS, store: Optional[DomainStore] = None,
+                 timings: Optional[StageTimings] = None, checks: Optional[Sequence] = None):
+        if existence_check not in EXISTENCE_CHECKS:
+            raise ValueError(f"existence_check must be one of {EXISTENCE_CHECKS}")
+        self.existence_check = existence_check
         self.email_regex = re.compile(
             r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         )
@@ -17,6 +80,18 @@ class EmailVerifier:
             'support', 'help', 'sales', 'info', 'contact', 'billing', 'security',
             'abuse', 'noreply', 'marketing', 'jobs', 'hr', 'no-reply', 'donotreply'
         }
+        self.cache = cache if cache is not None else DNSCache(cache_size, cache_max_ttl)
+        self.resolver = resolver if resolver is not None else build_resolver(
+            resolver_class=self.resolver_class
+        )
+        self.store = store
+        self.timings = timings
+        self.checks = CheckPipeline(checks if checks is not None else default_checks())
+        self.dns_in_flight = 0
+        self._query_counts: Dict[Tuple[str, str], int] = {}
+        self._query_lock = threading.Lock()
+        self._address_pool = None
+        self._address_pool_lock = threading.Lock()
     
     def _load_disposable_domains(self) -> Set[str]:
         """Load disposable email domains from file."""
@@ -41,63 +116,289 @@ class EmailVerifier:
         Returns:
             'VALID', 'INVALID', or 'RISKY'
         """
-        email = email.strip().lower()
+        status, domain = self._check_address(email)
+        if status is not None:
+            return status
+        return self._check_domain(domain)
+    
+    def verify_result(self, email: str) -> VerificationResult:
+        """
+        Validate email like verify(), keeping the reason and the DNS data.
         
-        if not email:
-            return 'INVALID'
+        Returns:
+            VerificationResult with status, reason, domain, MX hosts and timings
+        """
+        start = time.perf_counter()
+        status, reason, domain = self._classify_address(email)
+        checked = time.perf_counter()
+        if status is not None:
+            return VerificationResult(email, status, reason, domain, check_seconds=checked - start)
+        record = self._resolve_domain(domain)
+        return VerificationResult.for_domain(email, record, checked - start,
+                                             time.perf_counter() - checked)
+    
+    def _check_address(self, email: str) -> Tuple[Optional[str], str]:
+        """
+        Run the checks that need no network access.
         
-        # Syntax check
-        if not self.email_regex.match(email):
-            return 'INVALID'
+        Returns:
+            (status, domain) where status is None if DNS checks are still needed
+        """
+        status, _, domain = self._classify_address(email)
+        return status, domain
+    
+    def _classify_address(self, email: str) -> Tuple[Optional[str], Optional[Reason], str]:
+        """
+        Run the checks that need no network access, cheapest first.
+        
+        Returns:
+            (status, reason, domain) where status and reason are None if DNS
+            checks are still needed
+        """
+        email = normalize_email(email)
+        if not email:
+            return 'INVALID', Reason.EMPTY, ''
+        return self.checks.classify(self, email)
+    
+    def _check_domain(self, domain: str) -> str:
+        """Run the DNS checks for a domain that passed the address checks."""
+        return self._resolve_domain(domain).status
+    
+    def _resolve_domain(self, domain: str) -> DomainRecord:
+        """DNS results for a domain, from the domain store or fresh lookups."""
+        if self.store is not None:
+            record = self._stored(domain)
+            if record is not None:
+                return record
+        return self._record_domain(self.checks.resolve(self, domain))
+    
+    def _stored(self, domain: str) -> Optional[DomainRecord]:
+        """Look a domain up in the domain store."""
+        if self.timings is None:
+            return self.store.get(domain, self.existence_check)
+        started = time.perf_counter()
+        record = self.store.get(domain, self.existence_check)
+        self.timings.record('store', time.perf_counter() - started)
+        return record
+    
+    def _record_domain(self, record: DomainRecord) -> DomainRecord:
+        """Save the DNS results for a domain to the domain store."""
+        if self.store is not None:
+            self.store.put(record.domain, self.existence_check, record.mx_hosts, record.exists,
+                           record.rcode)
+        return record
+    
+    def close(self) -> None:
+        """Flush the domain store and release worker threads."""
+        if self.store is not None:
+            self.store.close()
+        if self._address_pool is not None:
+            self._address_pool.shutdown(wait=False)
+            self._address_pool = None
+    
+    def _existence_rcode(self, domain: str, mx_records: list) -> str:
+        """
+        Apply the existence_check policy once MX records are known.
         
-        if '@' not in email:
-            return 'INVALID'
+        Returns:
+            NOERROR if existence is proven, otherwise the kind of the failed
+            address lookups (a transient kind if any of them was transient)
+        """
+        if self.existence_check == EXISTENCE_MX:
+            return NOERROR
+        failures = []
+        if self.existence_check == EXISTENCE_MX_TARGET and mx_records[0]:
+            # Usually answered from glue cached with the MX answer, or from
+            # a lookup shared by every domain using the same mail host
+            rcode = self._address_rcode(mx_records[0].lower())
+            if rcode == NOERROR:
+                return NOERROR
+            failures.append(rcode)
+        rcode = self._address_rcode(domain)
+        if rcode == NOERROR:
+            return NOERROR
+        return worst_failure(failures + [rcode])
+    
+    def verify_many(self, emails: Iterable[str], max_workers: int = 32,
+                    ordered: bool = True) -> Iterator[Tuple[str, str]]:
+        """
+        Validate many emails concurrently on a bounded thread pool.
         
-        username, domain = email.rsplit('@', 1)
+        At most max_workers * 4 emails are in flight at once, so `emails`
+        may be a lazy iterator of any length.
         
-        # Check for disposable domain
-        if domain in self.disposable_domains:
-            return 'RISKY'
+        Yields:
+            (email, status) pairs in input order, or in completion order
+            when ordered is False
+        """
+        window = max(1, max_workers) * 4
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            if ordered:
+                pending = deque()
+                for email in emails:
+                    pending.append((email, pool.submit(self.verify, email)))
+                    if len(pending) >= window:
+                        email, future = pending.popleft()
+                        yield email, future.result()
+                while pending:
+                    email, future = pending.popleft()
+                    yield email, future.result()
+            else:
+                pending = {}
+                for email in emails:
+                    pending[pool.submit(self.verify, email)] = email
+                    if len(pending) >= window:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield pending.pop(future), future.result()
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+    
+    def _address_rcode(self, domain: str) -> str:
+        """
+        Check if domain has A or AAAA records.
         
-        # Check for role-based email
-        username_clean = username.replace('.', '').replace('-', '').replace('_', '')
-        if username_clean in self.role_prefixes:
-            return 'RISKY'
+        Uncached A and AAAA queries are issued concurrently; the first
+        positive answer wins and the other query is cancelled if it has not
+        started yet (a query already running still completes and is cached).
         
-        # DNS MX record check
-        mx_records = self._get_mx_records(domain)
-        if not mx_records:
-            return 'INVALID'
+        Returns:
+            NOERROR if an address record exists, otherwise the failure kind
+            (see worst_failure)
+        """
+        uncached, failures = [], []
+        for rdtype in ('A', 'AAAA'):
+            cached, value = self.cache.get(domain, rdtype)
+            if not cached:
+                uncached.append(rdtype)
+            elif isinstance(value, NegativeAnswer):
+                failures.append(value.kind)
+            else:
+                return NOERROR
         
-        # Domain existence check (A record)
-        if not self._check_domain_exists(domain):
-            return 'RISKY'
+        if len(uncached) < 2:
+            for rdtype in uncached:
+                value = self._query(domain, rdtype, self._exists)
+                if value is True:
+                    return NOERROR
+                failures.append(value.kind)
+            return worst_failure(failures)
         
-        return 'VALID'
+        pool = self._get_address_pool()
+        futures = [pool.submit(self._query, domain, rdtype, self._exists) for rdtype in uncached]
+        for future in as_completed(futures):
+            value = future.result()
+            if value is True:
+                for other in futures:
+                    other.cancel()
+                return NOERROR
+            failures.append(value.kind)
+        return worst_failure(failures)
     
-    def _get_mx_records(self, domain: str) -> list:
-        """Check if domain has MX records."""
-        try:
-            records = dns.resolver.resolve(domain, 'MX')
-            mx_records = sorted([(r.preference, str(r.exchange).rstrip('.')) for r in records])
-            return [exchange for _, exchange in mx_records]
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.NoNameservers):
-            return []
-        except Exception:
-            return []
+    def _get_address_pool(self) -> ThreadPoolExecutor:
+        """Thread pool for concurrent A/AAAA queries, created on first use."""
+        with self._address_pool_lock:
+            if self._address_pool is None:
+                self._address_pool = ThreadPoolExecutor(max_workers=self.address_pool_size)
+            return self._address_pool
     
-    def _check_domain_exists(self, domain: str) -> bool:
-        """Check if domain has A or AAAA records."""
-        try:
-            dns.resolver.resolve(domain, 'A')
-            return True
-        except:
-            pass
+    @staticmethod
+    def _exists(records) -> bool:
+        return True
+    
+    def _mx_hosts(self, records) -> list:
+        """MX exchanges ordered by preference; A/AAAA glue for them is cached too."""
+        mx_records = sorted([(r.preference, str(r.exchange).rstrip('.')) for r in records])
+        for rrset in records.response.additional:
+            if rrset.rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA):
+                host = str(rrset.name).rstrip('.').lower()
+                self.cache.put(host, dns.rdatatype.to_text(rrset.rdtype), True, rrset.ttl)
+        return [exchange for _, exchange in mx_records]
+    
+    def _lookup(self, domain: str, rdtype: str, extract):
+        """
+        Resolve a record type through the DNS cache.
         
+        Positive answers are cached for their TTL, failures are negatively
+        cached by kind (NXDOMAIN, NOANSWER, NONAMESERVERS, TIMEOUT).
+        
+        Returns:
+            extract(answer) on success, a NegativeAnswer if the lookup failed
+        """
+        cached, value = self.cache.get(domain, rdtype)
+        if cached:
+            return value
+        return self._query(domain, rdtype, extract)
+    
+    def _query(self, domain: str, rdtype: str, extract):
+        """Query DNS, bypassing the cache lookup, and cache the outcome."""
+        started = self._begin_query()
         try:
-            dns.resolver.resolve(domain, 'AAAA')
-            return True
-        except:
-            pass
+            records = self.resolver.resolve(domain, rdtype)
+        except Exception as e:
+            negative = self._cache_failure(domain, rdtype, e)
+            self._end_query(rdtype, negative.kind, started)
+            return negative
+        self._end_query(rdtype, NOERROR, started)
         
-        return False
\ No newline at end of file
+        value = extract(records)
+        self.cache.put(domain, rdtype, value, records.rrset.ttl)
+        return value
+    
+    def _begin_query(self) -> float:
+        with self._query_lock:
+            self.dns_in_flight += 1
+        return time.perf_counter()
+    
+    def _end_query(self, rdtype: str, rcode: Optional[str], started: float) -> None:
+        """Count a finished DNS query by record type and outcome (None: abandoned)."""
+        if rcode is not None and self.timings is not None:
+            self.timings.record(f'dns {rdtype}', time.perf_counter() - started)
+        with self._query_lock:
+            self.dns_in_flight -= 1
+            if rcode is not None:
+                key = (rdtype, rcode)
+                self._query_counts[key] = self._query_counts.get(key, 0) + 1
+    
+    def query_counts(self) -> Dict[Tuple[str, str], int]:
+        """
+        DNS queries sent so far.
+        
+        Returns:
+            {(rdtype, rcode): count}; rcode is NOERROR or a negative answer
+            kind (NXDOMAIN, NOANSWER, NONAMESERVERS, TIMEOUT, ERROR)
+        """
+        with self._query_lock:
+            return dict(self._query_counts)
+    
+    def cache_counts(self) -> Dict[str, int]:
+        """DNS cache hits, misses, evictions and current entries."""
+        return {
+            'hits': self.cache.hits,
+            'misses': self.cache.misses,
+            'evictions': self.cache.evictions,
+            'entries': len(self.cache),
+        }
+    
+    def _cache_failure(self, domain: str, rdtype: str, error: Exception) -> NegativeAnswer:
+        """Negatively cache a failed lookup according to its kind."""
+        if isinstance(error, dns.resolver.NXDOMAIN):
+            responses = error.kwargs.get('responses') or {}
+            response = next(iter(responses.values()), None)
+            kind = NXDOMAIN
+            self.cache.put_negative(domain, rdtype, kind, soa_negative_ttl(response))
+        elif isinstance(error, dns.resolver.NoAnswer):
+            kind = NOANSWER
+            self.cache.put_negative(domain, rdtype, kind,
+                                    soa_negative_ttl(error.kwargs.get('response')))
+        elif isinstance(error, dns.resolver.NoNameservers):
+            kind = NONAMESERVERS
+            self.cache.put_negative(domain, rdtype, kind)
+        elif isinstance(error, dns.exception.Timeout):
+            kind = TIMEOUT
+            self.cache.put_negative(domain, rdtype, kind)
+        else:
+            kind = ERROR
+        return NegativeAnswer(kind)
\ No newline at end of file